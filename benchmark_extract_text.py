@@ -0,0 +1,235 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import extract_text
+
+"""
+Throughput benchmark and regression check for the extract_text cleaning functions.
+
+python benchmark_extract_text.py --sizes 1 10 --save-baseline   # record a baseline
+python benchmark_extract_text.py --sizes 1 10                   # fail if >15% slower than it
+python benchmark_extract_text.py --import-time                  # fail if importing takes >200 ms
+"""
+
+BENCHMARKED_FUNCTIONS = (
+    extract_text.fix_hyphenated_line_breaks,
+    extract_text.join_wrapped_lines,
+    extract_text.handle_sentence_ends_and_pauses,
+    extract_text.remove_citation_numbers,
+    extract_text.handle_quotes,
+    extract_text.convert_numbers,
+    extract_text.clean_pipeline,
+)
+DEFAULT_SIZES_MB = (1, 10, 100)
+DEFAULT_BASELINE = "extract_text_benchmark_baseline.json"
+DEFAULT_THRESHOLD = 0.15  # allowed throughput drop before the check fails
+IMPORT_TIME_BUDGET_MS = 200
+# format backends that must stay unloaded until a PDF/EPUB/OCR extraction needs them
+LAZY_BACKENDS = ("fitz", "pymupdf", "cv2", "pytesseract", "pdf2image", "numpy", "num2words", "bs4", "lxml")
+BASE_BLOCK_CHARS = 256 * 1024  # unique text generated once, then tiled up to the target size
+LINE_WIDTH = 72
+
+WORDS = (
+    "the of and to in that was he it with as his on be at by had not are but from or have an they "
+    "which one you were her all she there would their we him been has when who will more no if out "
+    "so said what up its about into than them can only other new some could time these two may then "
+    "do first any my now such like our over man me even most made after also did many before must "
+    "through back years where much your way well down should because each just those people how too "
+    "little state good very make world still own see men work long get here between both life being "
+    "under never day same another know while last might us great old year off come since against go "
+    "came right used take three states himself few house use during without again place american "
+    "around however home small found thought went say part once general high upon school every "
+    "understanding interpretation philosophical circumstances nevertheless consciousness"
+).split()
+ABBREVIATIONS = ("Mr.", "Mrs.", "Dr.", "Prof.", "St.", "e.g.", "i.e.", "etc.", "vs.", "p.", "pp.", "No.")
+
+
+def _sentence(rng):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(6, 24))]
+    if rng.random() < 0.15:
+        words.insert(rng.randrange(len(words)), rng.choice(ABBREVIATIONS))
+    if rng.random() < 0.2:
+        start = rng.randrange(len(words))
+        words[start] = "“" + words[start]
+        end = min(len(words) - 1, start + rng.randint(1, 6))
+        words[end] = words[end] + "”"
+    if rng.random() < 0.1:
+        words.insert(rng.randrange(len(words)), f'"{rng.choice(WORDS)}"')
+    words[0] = words[0].capitalize()
+    ending = rng.choice(".....?!;:")
+    if rng.random() < 0.2:
+        ending += str(rng.randint(1, 120))  # citation number glued to punctuation
+    if rng.random() < 0.05:
+        ending += f" [{rng.randint(1, 60)}]"
+    return " ".join(words) + ending
+
+
+def _wrap_paragraph(text, rng):
+    # hard-wrap like a PDF text layer, hyphenating some words across the line break
+    lines = []
+    line = ""
+    for word in text.split(" "):
+        if line and len(line) + 1 + len(word) > LINE_WIDTH:
+            if len(word) > 6 and rng.random() < 0.3:
+                cut = rng.randint(3, len(word) - 3)
+                lines.append(f"{line} {word[:cut]}-")
+                line = word[cut:]
+                continue
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def generate_book_text(size_mb, seed=0):
+    """Synthetic book text of about size_mb MB with wrapped lines, hyphenation, citations and quotes."""
+    rng = random.Random(seed)
+    paragraphs = []
+    length = 0
+    page = 1
+    while length < BASE_BLOCK_CHARS:
+        paragraph = _wrap_paragraph(" ".join(_sentence(rng) for _ in range(rng.randint(2, 8))), rng)
+        if rng.random() < 0.1:
+            paragraph += f"\n{page}"  # stray page number line
+            page += 1
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+    block = "\n\n".join(paragraphs) + "\n\n"
+    target = size_mb * 1024 * 1024
+    return (block * (target // len(block) + 1))[:target]
+
+
+def time_function(func, text, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmarks(sizes_mb, repeats):
+    results = {}
+    for size_mb in sizes_mb:
+        text = generate_book_text(size_mb)
+        text_mb = len(text.encode('utf-8')) / (1024 * 1024)
+        # a single pass is already seconds per function at 100 MB
+        size_repeats = 1 if size_mb >= 100 else repeats
+        print(f"--- {size_mb} MB input ({text_mb:.1f} MB utf-8, best of {size_repeats}) ---")
+        for func in BENCHMARKED_FUNCTIONS:
+            # every size starts with a cold num2words cache; repeats then show the memoised cost
+            extract_text._number_to_words.cache_clear()
+            elapsed = time_function(func, text, size_repeats)
+            throughput = text_mb / elapsed if elapsed else float('inf')
+            results[f"{size_mb}MB/{func.__name__}"] = round(throughput, 3)
+            print(f"  {func.__name__:<34} {elapsed:8.3f}s  {throughput:8.2f} MB/s")
+        extract_text._number_to_words.cache_clear()
+        extract_text.set_tts_mode(True)
+        elapsed = time_function(extract_text.clean_pipeline, text, size_repeats)
+        extract_text.set_tts_mode(False)
+        throughput = text_mb / elapsed if elapsed else float('inf')
+        results[f"{size_mb}MB/clean_pipeline_tts"] = round(throughput, 3)
+        print(f"  {'clean_pipeline (tts)':<34} {elapsed:8.3f}s  {throughput:8.2f} MB/s  "
+              f"{extract_text._number_to_words.cache_info()}")
+    return results
+
+
+def compare_to_baseline(results, baseline, threshold):
+    regressions = []
+    for key, throughput in results.items():
+        reference = baseline.get(key)
+        if not reference:
+            continue
+        change = (throughput - reference) / reference
+        marker = "REGRESSION" if change < -threshold else ""
+        print(f"  {key:<44} {reference:8.2f} -> {throughput:8.2f} MB/s ({change:+.1%}) {marker}")
+        if change < -threshold:
+            regressions.append(key)
+    return regressions
+
+
+def measure_import_time(repeats):
+    """Best-of cumulative import time of extract_text in a fresh interpreter, plus eagerly loaded backends."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    best_us = float('inf')
+    loaded = set()
+    for _ in range(repeats):
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", "import extract_text"],
+                                   cwd=script_dir, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(f"import extract_text failed:\n{completed.stderr}")
+        # lines look like "import time:       512 |       1843 |   extract_text"
+        for line in completed.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            name = name.strip()
+            if name == "extract_text":
+                best_us = min(best_us, int(cumulative))
+            elif name.split(".")[0] in LAZY_BACKENDS:
+                loaded.add(name.split(".")[0])
+    return best_us / 1000, sorted(loaded)
+
+
+def check_import_time(repeats, budget_ms):
+    elapsed_ms, loaded = measure_import_time(repeats)
+    print(f"import extract_text: {elapsed_ms:.1f} ms (best of {repeats}, budget {budget_ms} ms)")
+    if loaded:
+        print(f"Backends imported eagerly: {', '.join(loaded)}")
+    return elapsed_ms <= budget_ms and not loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extract_text cleaning functions on synthetic books.")
+    parser.add_argument("--sizes", type=int, nargs='+', default=list(DEFAULT_SIZES_MB),
+                        help="Input sizes in MB (default: 1 10 100)")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per function, best is kept (default: 3)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help=f"Baseline JSON file (default: {DEFAULT_BASELINE})")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Fail when throughput drops by more than this fraction (default: 0.15)")
+    parser.add_argument("--import-time", action="store_true",
+                        help=f"Only check the cold import time of extract_text (budget: {IMPORT_TIME_BUDGET_MS} ms)")
+    args = parser.parse_args()
+
+    if args.import_time:
+        if not check_import_time(args.repeats, IMPORT_TIME_BUDGET_MS):
+            sys.exit(1)
+        return
+
+    results = run_benchmarks(args.sizes, args.repeats)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to '{args.baseline}'")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at '{args.baseline}', run with --save-baseline first.")
+        return
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    print(f"--- Compared to '{args.baseline}' (threshold {args.threshold:.0%}) ---")
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+    print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
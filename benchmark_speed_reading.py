@@ -0,0 +1,106 @@
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # SpeedReader opens a window; none is needed here
+
+import speed_reading
+
+"""
+Benchmark of SpeedReader word timing on synthetic books.
+
+python benchmark_speed_reading.py --words 100000 500000
+
+Compares the per-word get_delay path with the batch timing engine that computes
+word_delays and cumulative_times in one vectorised pass, and checks they agree. Also
+times a +/- speed change: a full timing recompute against scaling the precomputed
+WPM-independent weight sums.
+"""
+
+DEFAULT_WORD_COUNTS = (100_000, 500_000)
+VOCABULARY_SIZE = 30_000
+SPEED_CHANGES = 100
+PUNCTUATION = ("", "", "", "", "", "", ",", ",", ".", ";", ":", "?", "!", "—", '"', "'")
+
+
+def generate_words(count, seed=0):
+    """Zipf-distributed synthetic words with attached punctuation, like a tokenised book."""
+    rng = random.Random(seed)
+    letters = "etaoinshrdlcumwfgypbvkjxqz"
+    vocabulary = []
+    for _ in range(VOCABULARY_SIZE):
+        length = min(1 + int(rng.expovariate(0.25)), 18)
+        vocabulary.append("".join(rng.choice(letters[:8 + length]) for _ in range(length)))
+    weights = [1 / rank for rank in range(1, VOCABULARY_SIZE + 1)]
+    words = rng.choices(vocabulary, weights=weights, k=count)
+    return [word + rng.choice(PUNCTUATION) for word in words]
+
+
+def _new_reader(words):
+    return speed_reading.SpeedReader(config=speed_reading.ReaderConfig(), words=words)
+
+
+def time_per_word(words):
+    reader = _new_reader(words)
+    start = time.perf_counter()
+    delays = [reader.get_delay(word) for word in reader.words]
+    total = 0
+    cumulative = [0] * len(delays)
+    for i in reversed(range(len(delays))):
+        total += delays[i]
+        cumulative[i] = total
+    return time.perf_counter() - start, delays
+
+
+def time_vectorised(words):
+    reader = _new_reader(words)
+    start = time.perf_counter()
+    delays = reader.word_delays
+    reader.cumulative_times
+    return time.perf_counter() - start, delays
+
+
+def time_speed_changes(words):
+    """Seconds per speed change: recomputing all delays vs scaling the weight prefix sum."""
+    reader = _new_reader(words)
+    reader.cumulative_weights  # built once at load time
+    index = len(words) // 2
+    start = time.perf_counter()
+    for step in range(SPEED_CHANGES):
+        reader.wpm = 300 + step
+        delays = reader.word_delays
+        int(delays[index:].sum())
+    recompute_seconds = (time.perf_counter() - start) / SPEED_CHANGES
+    start = time.perf_counter()
+    for step in range(SPEED_CHANGES):
+        reader.wpm = 300 + step
+        reader.time_left_ms(index)
+        reader.effective_wpm_from_remaining()
+    scaled_seconds = (time.perf_counter() - start) / SPEED_CHANGES
+    return recompute_seconds, scaled_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SpeedReader word timing precomputation.")
+    parser.add_argument("--words", type=int, nargs='+', default=list(DEFAULT_WORD_COUNTS),
+                        help="Book sizes in words (default: 100000 500000)")
+    args = parser.parse_args()
+
+    for count in args.words:
+        words = generate_words(count)
+        per_word_seconds, per_word_delays = time_per_word(words)
+        vectorised_seconds, vectorised_delays = time_vectorised(words)
+        match = list(vectorised_delays) == per_word_delays
+        print(f"--- {count} words ---")
+        print(f"  per-word get_delay   {per_word_seconds:8.3f}s")
+        print(f"  vectorised           {vectorised_seconds:8.3f}s  ({per_word_seconds / vectorised_seconds:.1f}x)  "
+              f"{'identical' if match else 'MISMATCH'}")
+        recompute_seconds, scaled_seconds = time_speed_changes(words)
+        print(f"  speed change, recompute {recompute_seconds * 1000:8.3f}ms")
+        print(f"  speed change, scaled    {scaled_seconds * 1000:8.3f}ms")
+    speed_reading.pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
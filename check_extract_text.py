@@ -0,0 +1,110 @@
+import argparse
+import glob
+import io
+import os
+import sys
+
+import extract_text
+
+"""
+Golden-file check for extract_text output.
+
+python check_extract_text.py            # exit 1 if any output differs from its .expected.txt
+python check_extract_text.py --update   # rewrite the expected files after an intended change
+
+Every fixtures/extract_text/<group>/<name>.in.txt is run through the group's function and
+compared byte for byte with <name>.expected.txt. Every HTML/XHTML document under
+fixtures/extract_text/html_backends is converted by the default basic_html_to_text backend
+and the other exact ones, and compared with the bs4 reference output (needs bs4 installed).
+The clean_pipeline inputs are also streamed through clean_pipeline_stream in small chunks,
+which must give the same text as cleaning them whole.
+"""
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "extract_text")
+HTML_BACKENDS_DIR = os.path.join(FIXTURES_DIR, "html_backends")
+STREAM_GROUP = 'clean_pipeline'
+STREAM_CHUNK_SIZES = (400, 1024, 2048)  # several cuts per long fixture; much smaller sizes force-cut mid-sentence
+HTML_REFERENCE_BACKEND = 'bs4'
+HTML_EXACT_BACKENDS = ('stream',)  # must reproduce bs4; lxml merges text around stray end tags
+GOLDEN_GROUPS = {
+    'abbreviations': extract_text.expand_abbreviations_and_initials,
+    'clean_pipeline': extract_text.clean_pipeline,
+}
+
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def _write(path, text):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+
+
+def check_golden(update=False):
+    """Run every golden case; returns the list of failing case paths."""
+    failures = []
+    for group, func in GOLDEN_GROUPS.items():
+        for input_path in sorted(glob.glob(os.path.join(FIXTURES_DIR, group, "*.in.txt"))):
+            expected_path = input_path[:-len(".in.txt")] + ".expected.txt"
+            output = func(_read(input_path))
+            case = os.path.relpath(input_path, FIXTURES_DIR)
+            if update:
+                _write(expected_path, output)
+                print(f"  updated {case}")
+            elif not os.path.exists(expected_path) or output != _read(expected_path):
+                failures.append(case)
+                print(f"  FAIL {case}")
+            else:
+                print(f"  ok   {case}")
+    return failures
+
+
+def check_html_backends():
+    """Compare the default and exact HTML backends with bs4; returns the list of failing cases."""
+    failures = []
+    for input_path in sorted(glob.glob(os.path.join(HTML_BACKENDS_DIR, "*.*htm*"))):
+        html = _read(input_path)
+        reference = extract_text.basic_html_to_text(html, backend=HTML_REFERENCE_BACKEND)
+        for backend in sorted({extract_text.HTML_BACKEND, *HTML_EXACT_BACKENDS} - {HTML_REFERENCE_BACKEND}):
+            case = f"{os.path.relpath(input_path, FIXTURES_DIR)} [{backend}]"
+            if extract_text.basic_html_to_text(html, backend=backend) != reference:
+                failures.append(case)
+                print(f"  FAIL {case}")
+            else:
+                print(f"  ok   {case}")
+    return failures
+
+
+def check_stream_matches_whole():
+    """Compare clean_pipeline_stream with clean_pipeline; returns the list of failing cases."""
+    failures = []
+    for input_path in sorted(glob.glob(os.path.join(FIXTURES_DIR, STREAM_GROUP, "*.in.txt"))):
+        text = _read(input_path)
+        whole = extract_text.clean_pipeline(text)
+        for chunk_size in STREAM_CHUNK_SIZES:
+            streamed = io.StringIO()
+            extract_text.clean_pipeline_stream(text.splitlines(keepends=True), streamed, chunk_size)
+            case = f"{os.path.relpath(input_path, FIXTURES_DIR)} [stream {chunk_size}]"
+            if streamed.getvalue() != whole:
+                failures.append(case)
+                print(f"  FAIL {case}")
+            else:
+                print(f"  ok   {case}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare extract_text output against checked-in golden files.")
+    parser.add_argument("--update", action="store_true", help="Rewrite the expected files from the current output")
+    args = parser.parse_args()
+
+    failures = check_golden(args.update) + check_html_backends() + check_stream_matches_whole()
+    if failures:
+        print(f"{len(failures)} golden case(s) differ.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
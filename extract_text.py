@@ -1,40 +1,180 @@
-import fitz  # PyMuPDF
 import regex as re
 import os
 import sys
 import zipfile
 import time
 import unicodedata  # for normalization
-from bs4 import BeautifulSoup  # for EPUB parsing and HTML extraction
-from num2words import num2words
+import importlib
+from html.parser import HTMLParser
 import traceback  # for detailed error logging if needed
-import pytesseract as tess  # image pdfs
-import cv2  # image pdfs
-from pdf2image import convert_from_path  # image pdfs
-import numpy as np
-import pymupdf
+import argparse
+import glob
+import json
+import hashlib
+import shutil
+import sqlite3
+from contextlib import contextmanager
+from functools import lru_cache
+from multiprocessing import Pool, cpu_count
+from text_source import MappedTextSource
 
-HEADER_THRESHOLD = 50  # Pixels from top to ignore
-FOOTER_THRESHOLD = 50  # Pixels from bottom to ignore
 
+class _LazyModule:
+    """Module imported on first attribute access.
+
+    The PDF/OCR/EPUB backends take over a second to import; a TXT or HTML extraction
+    never touches most of them, so they are only loaded when a format needs them.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+fitz = _LazyModule('fitz')  # PyMuPDF
+pymupdf = _LazyModule('pymupdf')
+bs4 = _LazyModule('bs4')  # for EPUB parsing and HTML extraction
+etree = _LazyModule('lxml.etree')  # fast, opt-in HTML-to-text backend
+num2words = _LazyModule('num2words')
+tess = _LazyModule('pytesseract')  # image pdfs
+cv2 = _LazyModule('cv2')  # image pdfs
+pdf2image = _LazyModule('pdf2image')  # image pdfs
+np = _LazyModule('numpy')
+
+HEADER_THRESHOLD = 50  # Pixels from top to ignore (fallback for documents too short to detect repeats)
+FOOTER_THRESHOLD = 50  # Pixels from bottom to ignore (same fallback)
+HEADER_FOOTER_REPEAT_RATIO = 0.3  # Margin blocks repeated on more than this share of pages are dropped
+HEADER_FOOTER_ZONE = 0.2  # Top/bottom fraction of the page where running heads/feet are looked for
+HEADER_FOOTER_BANDS = 40  # Vertical position buckets used in block fingerprints
+HEADER_FOOTER_MIN_PAGES = 4
+HEADER_FOOTER_WINDOW = 4  # Pages on either side searched for local repeats (chapter-title running heads)
+HEADER_FOOTER_WINDOW_MIN = 3  # Pages within that window a margin block must appear on to be dropped
+HTML_BACKEND = 'stream'  # basic_html_to_text backend: 'stream' (html.parser, no tree), 'bs4' or 'lxml'
+# (lxml is fastest but libxml2 drops stray end tags, so '<p>a</span>b' reads 'ab' where bs4 gives 'a\nb')
+PAGE_SAMPLE_SIZE = 12  # Pages inspected by get_pdf_page_types before classifying every page
+NUMBER_WORDS_CACHE_SIZE = 65536  # Memoised num2words conversions per process
+TTS_MODE_ENV = "EXTRACT_TEXT_TTS"  # "1" enables number verbalisation; an env var so pool workers inherit it
+OCR_DPI = 300
+OCR_BATCH_SIZE = 8  # Pages rasterised at once per worker, bounds peak memory
+OCR_CROP = (0.1, 0.9)  # Vertical fraction of the page kept for OCR ('fixed' crop)
+OCR_THRESHOLD = 200  # Binarisation level for the 'fixed' threshold
+OCR_CACHE_FILE = ".ocr_cache.sqlite"  # Sidecar per-page OCR cache in the output directory
+OCR_RASTER_DIR = ".ocr_rasters"  # Cached grayscale page rasters next to the OCR cache, re-tuning skips pdftocairo
+OCR_KEEP_RASTERS_ENV = "EXTRACT_TEXT_KEEP_OCR_RASTERS"  # "1" keeps OCR_RASTER_DIR; off by default, rasters are large
+OCR_PREPROCESS_ENV = "EXTRACT_TEXT_OCR_PREPROCESS"  # JSON preprocessing settings, inherited by pool workers
+OCR_PREPROCESS_DEFAULTS = {'deskew': False, 'crop': 'fixed', 'denoise': False, 'threshold': 'fixed'}
+OCR_CROP_MODES = ('fixed', 'detect', 'none')
+OCR_THRESHOLD_MODES = ('fixed', 'adaptive', 'otsu')
+OCR_ADAPTIVE_BLOCK = 31  # Neighbourhood (pixels, odd) for the 'adaptive' threshold
+OCR_ADAPTIVE_C = 15
+OCR_DENOISE_STRENGTH = 10
+OCR_MAX_SKEW = 10.0  # Degrees; larger detected angles are treated as misdetections
+OCR_CROP_MARGIN = 0.02  # Fraction of the page kept around detected content
+SUPPORTED_EXTENSIONS = ('.pdf', '.epub', '.txt', '.html', '.htm')
+PIPELINE_VERSION = 6  # Bump whenever extraction/cleaning output changes; invalidates every manifest
+MANIFEST_FILE = ".extract_manifest.json"  # Per-book record of the input an output was built from
+STREAM_CHUNK_SIZE = 1 << 20  # Characters cleaned at once in streaming mode
+STREAM_THRESHOLD = 32 << 20  # Inputs larger than this (bytes/characters) are cleaned in chunks
+
+
+# --- Instrumentation ---
+
+class StageProfiler:
+    """Accumulates wall time, calls, characters in/out and pages per pipeline stage.
+
+    Stages nest and are keyed by their ';'-joined stack, the collapsed-stack format that
+    flamegraph.pl and speedscope read directly. Disabled by default; a disabled stage()
+    only hands back a scratch dict.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.stages = {}
+        self._stack = []
+        self._child_seconds = []
+
+    def reset(self):
+        self.stages.clear()
+        self._stack.clear()
+        self._child_seconds.clear()
+
+    @contextmanager
+    def stage(self, name, chars_in=0):
+        """Time a block; the caller may set 'chars_out' and 'pages' on the yielded dict."""
+        info = {'chars_out': 0, 'pages': 0}
+        if not self.enabled:
+            yield info
+            return
+        self._stack.append(name)
+        self._child_seconds.append(0.0)
+        key = ';'.join(self._stack)
+        start = time.perf_counter()
+        try:
+            yield info
+        finally:
+            elapsed = time.perf_counter() - start
+            child_seconds = self._child_seconds.pop()
+            self._stack.pop()
+            if self._child_seconds:
+                self._child_seconds[-1] += elapsed
+            entry = self.stages.setdefault(key, {
+                'calls': 0, 'seconds': 0.0, 'self_seconds': 0.0, 'chars_in': 0, 'chars_out': 0, 'pages': 0
+            })
+            entry['calls'] += 1
+            entry['seconds'] += elapsed
+            entry['self_seconds'] += elapsed - child_seconds
+            entry['chars_in'] += chars_in
+            entry['chars_out'] += info['chars_out']
+            entry['pages'] += info['pages']
+
+    def report(self):
+        stages = {}
+        for key, entry in self.stages.items():
+            seconds = entry['seconds']
+            stages[key] = dict(entry,
+                               chars_per_sec=round(entry['chars_in'] / seconds) if seconds else None,
+                               pages_per_sec=round(entry['pages'] / seconds, 2) if seconds and entry['pages'] else None)
+        folded = [f"{key} {int(entry['self_seconds'] * 1e6)}" for key, entry in self.stages.items()]
+        return {'stages': stages, 'folded': folded}
+
+    def dump(self, path):
+        """Write the JSON report to path and collapsed stacks (microseconds) to path + '.folded'."""
+        report = self.report()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        with open(path + '.folded', 'w', encoding='utf-8') as f:
+            f.write('\n'.join(report['folded']) + '\n')
+        return report
+
+
+PROFILER = StageProfiler()
+
+
+# --- Cleaning (patterns compiled once at import time) ---
+
+_DOUBLE_HYPHEN_BREAK_RE = re.compile(r'(?<=\w)-\s*\n\s*-(?=\w)')
+_HYPHEN_BREAK_RE = re.compile(r'(?P<left>\w)-\s*\n\s*(?P<right>\w)')
+_HYPHEN_SPACE_RE = re.compile(r'(\w)-\s+(\w)')
+
+def _join_if_hyphenation(m: re.Match) -> str:
+    left = m.group('left')
+    right = m.group('right')
+    if right.isalpha() and right.islower():
+        return left + right
+    return left + '-' + right
 
 def fix_hyphenated_line_breaks(text: str) -> str:
     if not text:
         return text
     text = text.replace('\u00AD', '-')
-    text = re.sub(r'(?<=\w)-\s*\n\s*-(?=\w)', '-', text)
-    def join_if_hyphenation(m: re.Match) -> str:
-        left = m.group('left')
-        right = m.group('right')
-        if right.isalpha() and right.islower():
-            return left + right
-        return left + '-' + right
-    text = re.sub(
-        r'(?P<left>\w)-\s*\n\s*(?P<right>\w)',
-        join_if_hyphenation,
-        text
-    )
-    text = re.sub(r'(\w)-\s+(\w)', r'\1-\2', text)
+    text = _DOUBLE_HYPHEN_BREAK_RE.sub('-', text)
+    text = _HYPHEN_BREAK_RE.sub(_join_if_hyphenation, text)
+    text = _HYPHEN_SPACE_RE.sub(r'\1-\2', text)
     return text
 
 
@@ -44,68 +184,135 @@ def normalize_text(text):
     text = text.replace('–', ' – ')
     return text
 
+ABBREVIATIONS = (
+    ('Mr.', 'Mister'), ('Mrs.', 'Misses'), ('Ms.', 'Miss'), ('Dr.', 'Doctor'),
+    ('Prof.', 'Professor'), ('Jr.', 'Junior'), ('Sr.', 'Senior'),
+    ('vs.', 'versus'), ('etc.', 'etcetera'), ('i.e.', 'that is'),
+    ('e.g.', 'for example'), ('cf.', 'compare'), ('St.', 'Saint'),
+    ('Vol.', 'Volume'), ('No.', 'Number'), ('pp.', 'pages'), ('p.', 'page'),
+)
+# One factored prefix instead of an alternation of whole entries, which the engine would try
+# branch by branch at every position; the matched entry is then found by its lowercased text.
+_ABBREVIATION_RE = re.compile(
+    r'\b(?:' + '|'.join(sorted((re.escape(abbr[:-1]) for abbr, _ in ABBREVIATIONS), key=len, reverse=True)) + r')\.',
+    re.IGNORECASE
+)
+_ABBREVIATION_ENTRIES = {abbr.lower(): (index, expansion) for index, (abbr, expansion) in enumerate(ABBREVIATIONS)}
+
+def _abbreviation_entry(matched):
+    entry = _ABBREVIATION_ENTRIES.get(matched.lower())
+    if entry is None:
+        # case-insensitive matches that lower() doesn't map back, e.g. the long s in "Mrſ."
+        entry = next(_ABBREVIATION_ENTRIES[abbr.lower()] for abbr, _ in ABBREVIATIONS
+                     if re.fullmatch(re.escape(abbr), matched, re.IGNORECASE))
+    return entry
+_INITIAL_RE = re.compile(r'([A-Z])\.(?=\s*[A-Z])')
+_SPACES_RE = re.compile(r' +')
+
+def _expand_abbreviations(text):
+    # One scan over the whole table instead of one re.sub per entry. To stay identical to
+    # applying the entries in order, an abbreviation glued to an already expanded, earlier-listed
+    # one ("Mr.Dr.") is left alone, since that expansion ends in a letter and kills its \b; the
+    # scan then resumes inside it, where a later entry may still match ("Dr.i.e.g.").
+    parts = []
+    pos = 0
+    last_end = -1
+    last_index = None
+    m = _ABBREVIATION_RE.search(text)
+    while m:
+        index, expansion = _abbreviation_entry(m.group())
+        if m.start() == last_end and last_index < index:
+            m = _ABBREVIATION_RE.search(text, m.start() + 1)
+            continue
+        parts.append(text[pos:m.start()])
+        parts.append(expansion)
+        pos = last_end = m.end()
+        last_index = index
+        m = _ABBREVIATION_RE.search(text, pos)
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return ''.join(parts)
+
 def expand_abbreviations_and_initials(text):
-    abbreviations = {
-        r'\bMr\.': 'Mister', r'\bMrs\.': 'Misses', r'\bMs\.': 'Miss', r'\bDr\.': 'Doctor',
-        r'\bProf\.': 'Professor', r'\bJr\.': 'Junior', r'\bSr\.': 'Senior',
-        r'\bvs\.': 'versus', r'\betc\.': 'etcetera', r'\bi\.e\.': 'that is',
-        r'\be\.g\.': 'for example', r'\bcf\.': 'compare', r'\bSt\.': 'Saint',
-        r'\bVol\.': 'Volume', r'\bNo\.': 'Number', r'\bpp\.': 'pages', r'\bp\.': 'page',
-    }
-    for abbr, expansion in abbreviations.items():
-        text = re.sub(abbr, expansion, text, flags=re.IGNORECASE)
-    text = re.sub(r'([A-Z])\.(?=\s*[A-Z])', r'\1', text)
-    text = re.sub(r' +', ' ', text)
+    text = _expand_abbreviations(text)
+    text = _INITIAL_RE.sub(r'\1', text)
+    text = _SPACES_RE.sub(' ', text)
     return text
 
+_THOUSANDS_SEPARATOR_RE = re.compile(r'(?<=\d),(?=\d)')
+_NUMBER_RE = re.compile(r'\b(\d+)(st|nd|rd|th)?\b')
+
+@lru_cache(maxsize=NUMBER_WORDS_CACHE_SIZE)
+def _number_to_words(num, mode):
+    # the same few thousand numbers (years, page refs, chapter numbers) recur across a library
+    return num2words.num2words(num, to=mode)
+
+def _replace_number(match):
+    digits, suffix = match.group(1), match.group(2)
+    try:
+        num = int(digits)
+        if 1500 <= num <= 2100:
+            return _number_to_words(num, 'year')
+        elif suffix:
+            return _number_to_words(num, 'ordinal')
+        else:
+            return _number_to_words(num, 'cardinal')
+    except (ValueError, OverflowError, NotImplementedError):
+        return match.group(0)
+
 def convert_numbers(text):
-    # currently unused in pipeline
-    text = re.sub(r'(?<=\d),(?=\d)', '', text)
-    def replace_match(match):
-        num_str = match.group(0)
-        try:
-            if '.' in num_str:
-                return num_str
-            num = int(num_str)
-            if 1500 <= num <= 2100:
-                return num2words(num, to='year')
-            elif match.group(1):
-                return num2words(num, to='ordinal')
-            else:
-                return num2words(num)
-        except ValueError:
-            return num_str
-    pattern = r'\b(\d+)(st|nd|rd|th)?\b'
-    text = re.sub(pattern, replace_match, text)
+    text = _THOUSANDS_SEPARATOR_RE.sub('', text)
+    text = _NUMBER_RE.sub(_replace_number, text)
     return text
 
+def set_tts_mode(enabled):
+    """Turn number verbalisation on/off for this process and any pool started afterwards."""
+    os.environ[TTS_MODE_ENV] = "1" if enabled else "0"
+
+def tts_mode_enabled():
+    return os.environ.get(TTS_MODE_ENV) == "1"
+
+_WORD_PERIOD_RE = re.compile(r'(?<=\w)([.])')
+_LINE_END_PUNCT_RE = re.compile(r'[.!?;:]$')
+_LIST_ITEM_RE = re.compile(r'^[-\*\u2022•\d+\.\s]+')
+_SENTENCE_END_RE = re.compile(r'([.!?])\s*')
+
 def handle_sentence_ends_and_pauses(text):
-    text = re.sub(r'(?<=\w)([.])', r' \1', text) # removed ",!?;:"
-    text = re.sub(r' +', ' ', text)
+    text = _WORD_PERIOD_RE.sub(r' \1', text) # removed ",!?;:"
+    text = _SPACES_RE.sub(' ', text)
     lines = text.splitlines()
     processed_lines = []
     for line in lines:
         stripped_line = line.strip()
         if stripped_line and \
-           not re.search(r'[.!?;:]$', stripped_line) and \
-           not re.match(r'^[-\*\u2022•\d+\.\s]+', stripped_line) and \
+           not _LINE_END_PUNCT_RE.search(stripped_line) and \
+           not _LIST_ITEM_RE.match(stripped_line) and \
            len(stripped_line.split()) > 3:
             line += '.'
         processed_lines.append(line)
     text = '\n'.join(processed_lines)
     # text = text.replace(';', ',')
     # text = re.sub(r'\s+-\s+', ', ', text)
-    text = re.sub(r'([.!?])\s*', r'\1\n', text)
+    text = _SENTENCE_END_RE.sub(r'\1\n', text)
     return text
 
+_BRACKET_NUMBER_RE = re.compile(r'\[\s*\d+\s*\]')
+_NUMBER_LINE_RE = re.compile(r'^\s*\d+\s*$', re.MULTILINE)
+_PUNCT_LINE_RE = re.compile(r'^\s*[.,;:!?\-—–_]+\s*$', re.MULTILINE)
+_BLANK_LINES_RE = re.compile(r'\n\s*\n')
+
 def remove_artifacts(text):
-    text = re.sub(r'\[\s*\d+\s*\]', '', text)
-    text = re.sub(r'^\s*\d+\s*$', '', text, flags=re.MULTILINE)
-    text = re.sub(r'^\s*[.,;:!?\-—–_]+\s*$', '', text, flags=re.MULTILINE)
-    text = re.sub(r'\n\s*\n', '\n\n', text)
+    text = _BRACKET_NUMBER_RE.sub('', text)
+    text = _NUMBER_LINE_RE.sub('', text)
+    text = _PUNCT_LINE_RE.sub('', text)
+    text = _BLANK_LINES_RE.sub('\n\n', text)
     text = text.strip()
     return text
 
+_WRAP_END_RE = re.compile(r'[.!?:)"»’]$')
+_WRAP_START_RE = re.compile(r'^[\sA-Z\d"«‘\[\*\-\u2022•]')
+
 def join_wrapped_lines(text):
     lines = text.splitlines()
     result_lines = []
@@ -116,8 +323,8 @@ def join_wrapped_lines(text):
         current_line = lines[i]
         prev_line_stripped = buffer.strip()
         if (prev_line_stripped and
-            not re.search(r'[.!?:)"»’]$', prev_line_stripped) and
-            not re.match(r'^[\sA-Z\d"«‘\[\*\-\u2022•]', current_line.strip()) and
+            not _WRAP_END_RE.search(prev_line_stripped) and
+            not _WRAP_START_RE.match(current_line.strip()) and
             len(prev_line_stripped.split()) > 1):
             buffer += " " + current_line.strip()
         else:
@@ -126,66 +333,354 @@ def join_wrapped_lines(text):
     result_lines.append(buffer)
     return '\n'.join(filter(None, [line.strip() for line in result_lines]))
 
-def basic_html_to_text(html_content):
-    soup = BeautifulSoup(html_content, 'html.parser')
+_HORIZONTAL_SPACE_RE = re.compile(r'[ \t]+')
+
+_SKIPPED_HTML_TAGS = frozenset(('script', 'style'))
+
+def _html_strings_bs4(html_content):
+    soup = bs4.BeautifulSoup(html_content, 'html.parser')
     for script_or_style in soup(["script", "style"]):
         script_or_style.decompose()
-    text = soup.get_text(separator='\n', strip=True)
-    text = re.sub(r'[ \t]+', ' ', text)
-    text = re.sub(r'\n\s*\n', '\n\n', text)
+    return soup.get_text(separator='\n', strip=True)
+
+
+class _HTMLTextCollector(HTMLParser):
+    """Collects text nodes straight from html.parser events without building a tree.
+
+    Text is flushed at every tag, comment or declaration, so each piece matches one
+    BeautifulSoup string and get_text(separator='\n', strip=True) output is reproduced.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.strings = []
+        self._pending = []
+        self._skip_depth = 0
+
+    def _flush(self):
+        if self._pending:
+            text = ''.join(self._pending).strip()
+            if text:
+                self.strings.append(text)
+            self._pending = []
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in _SKIPPED_HTML_TAGS:
+            self._skip_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self._flush()
+
+    def handle_endtag(self, tag):
+        self._flush()
+        if tag in _SKIPPED_HTML_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._pending.append(data)
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    def unknown_decl(self, data):
+        self._flush()
+        if data.startswith('CDATA[') and not self._skip_depth:
+            self._pending.append(data[len('CDATA['):])
+            self._flush()
+
+
+def _html_strings_stream(html_content):
+    collector = _HTMLTextCollector()
+    collector.feed(html_content)
+    collector.close()
+    collector._flush()
+    return '\n'.join(collector.strings)
+
+
+@lru_cache(maxsize=None)
+def _lxml_html_parser():
+    return etree.HTMLParser(encoding='utf-8')
+
+def _lxml_cdata_text(node):
+    # libxml2's HTML parser keeps <![CDATA[x]]> as a comment holding '[CDATA[x]]'; bs4 reads it as text
+    text = node.text or ''
+    if node.tag is etree.Comment and text.startswith('[CDATA[') and text.endswith(']]'):
+        return text[len('[CDATA['):-len(']]')]
+    return ''
+
+def _iter_lxml_strings(element):
+    # text and tails in document order
+    if element.text and element.tag not in _SKIPPED_HTML_TAGS:
+        yield element.text
+    yield from _iter_lxml_node_strings(element)
+
+def _iter_lxml_node_strings(nodes):
+    # comments/PIs (non-str tags) keep only their tail and CDATA
+    for node in nodes:
+        if not isinstance(node.tag, str):
+            yield _lxml_cdata_text(node)
+        elif node.tag not in _SKIPPED_HTML_TAGS:
+            yield from _iter_lxml_strings(node)
+        if node.tail:
+            yield node.tail
+
+def _html_strings_lxml(html_content):
+    if not html_content.strip():
+        return ''
+    # bytes, since lxml rejects str input that carries an <?xml encoding=...?> declaration
+    try:
+        root = etree.fromstring(html_content.encode('utf-8'), _lxml_html_parser())
+    except etree.XMLSyntaxError:
+        return _html_strings_stream(html_content)
+    if root is None:
+        return ''
+    # text after </html> is parsed into further top-level <html> elements beside root
+    top_level = [*reversed(list(root.itersiblings(preceding=True))), root, *root.itersiblings()]
+    stripped = (s.strip() for s in _iter_lxml_node_strings(top_level))
+    return '\n'.join(s for s in stripped if s)
+
+
+HTML_TO_TEXT_BACKENDS = {
+    'lxml': _html_strings_lxml,
+    'stream': _html_strings_stream,
+    'bs4': _html_strings_bs4,
+}
+
+def basic_html_to_text(html_content, backend=None):
+    backend = backend or HTML_BACKEND
+    with PROFILER.stage(f'html_to_text[{backend}]', chars_in=len(html_content)) as stage:
+        text = HTML_TO_TEXT_BACKENDS[backend](html_content)
+        text = _HORIZONTAL_SPACE_RE.sub(' ', text)
+        text = _BLANK_LINES_RE.sub('\n\n', text)
+        stage['chars_out'] = len(text)
     return text
 
+_CITATION_RE = re.compile(r'(?:(?<=\D)|^)([.,!?;:\'\"»\]\)‘’“”])\d+')
+_LINE_START_NUMBER_RE = re.compile(r'\n\d+ +')
+
 def remove_citation_numbers(text):
     if not text:
         return text
-    pattern = r'(?:(?<=\D)|^)([.,!?;:\'\"»\]\)‘’“”])\d+'
-    text = re.sub(pattern, r'\1', text)
-    return re.sub(r'\n\d+ +', r'\n', text)
+    text = _CITATION_RE.sub(r'\1', text)
+    return _LINE_START_NUMBER_RE.sub(r'\n', text)
+
 
+_SPACE_AFTER_OPEN_QUOTE_RE = re.compile(r'(?<=[“‘])\s+')
+_SPACE_BEFORE_CLOSE_QUOTE_RE = re.compile(r'\s+(?=[”’])')
+_PADDED_QUOTE_RE = re.compile(r'\" *(.*?) *\"')
+_STARRED_QUOTE_RE = re.compile(r'\*?([\"\'‘’“”])\*?')
 
 def handle_quotes(text):
-    text = re.sub(r'(?<=[“‘])\s+', r'', text)
-    text = re.sub(r'\s+(?=[”’])', r'', text)
-    text = re.sub(r'\" *(.*?) *\"', r'"\1"', text)
-    text = re.sub(r'\*?([\"\'‘’“”])\*?', r'\1', text)
+    text = _SPACE_AFTER_OPEN_QUOTE_RE.sub(r'', text)
+    text = _SPACE_BEFORE_CLOSE_QUOTE_RE.sub(r'', text)
+    text = _PADDED_QUOTE_RE.sub(r'"\1"', text)
+    text = _STARRED_QUOTE_RE.sub(r'\1', text)
     return text
 
+_MULTI_BLANK_RE = re.compile(r'\n\n+')
+
+def _collapse_whitespace(text):
+    text = _SPACES_RE.sub(' ', text)
+    text = _MULTI_BLANK_RE.sub('\n\n', text)
+    return text.strip()
+
+CLEANING_STEPS = (
+    normalize_text,
+    remove_citation_numbers,
+    join_wrapped_lines,
+    fix_hyphenated_line_breaks,
+    expand_abbreviations_and_initials,
+    handle_sentence_ends_and_pauses,
+    remove_artifacts,
+    handle_quotes,
+    _collapse_whitespace,
+)
+
+# TTS exports read numbers aloud, so digits are verbalised before sentence splitting
+TTS_CLEANING_STEPS = CLEANING_STEPS[:5] + (convert_numbers,) + CLEANING_STEPS[5:]
 
 def clean_pipeline(text):
     if not text: return ""
-    text = normalize_text(text)
-    text = remove_citation_numbers(text)
-    text = join_wrapped_lines(text)
-    text = fix_hyphenated_line_breaks(text)
-    text = expand_abbreviations_and_initials(text)
-    # text = convert_numbers(text)
-    text = handle_sentence_ends_and_pauses(text)
-    text = remove_artifacts(text)
-    text = handle_quotes(text)
-    text = re.sub(r' +', ' ', text)
-    text = re.sub(r'\n\n+', '\n\n', text)
-    text = text.strip()
+    steps = TTS_CLEANING_STEPS if tts_mode_enabled() else CLEANING_STEPS
+    with PROFILER.stage('clean_pipeline', chars_in=len(text)) as pipeline_stage:
+        for step in steps:
+            with PROFILER.stage(step.__name__, chars_in=len(text)) as step_stage:
+                text = step(text)
+                step_stage['chars_out'] = len(text)
+        pipeline_stage['chars_out'] = len(text)
     return text
 
+def iter_text_chunks(lines, chunk_size=STREAM_CHUNK_SIZE):
+    """Group lines into chunks of about chunk_size characters that end on a sentence-final line.
+
+    join_wrapped_lines never joins across a line ending in [.!?:)"»’] and such a line can't end
+    in a hyphenation, so the chunks clean independently. Blank lines are no boundary: wrapped
+    lines are joined straight through them. Lines without any such ending are force-cut at
+    4 * chunk_size to keep memory bounded.
+    """
+    buffer = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_size and (_WRAP_END_RE.search(line.rstrip()) or size >= 4 * chunk_size):
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+# Stands in for the previous chunk's last line, which iter_text_chunks always ends on a sentence-final one
+_STREAM_CONTEXT_LINE = "End.\n"
+
+def clean_pipeline_stream(lines, out_file, chunk_size=STREAM_CHUNK_SIZE):
+    """Run clean_pipeline chunk by chunk over an iterable of lines, writing to out_file as it goes.
+
+    Every chunk after the first is cleaned behind _STREAM_CONTEXT_LINE and that line's output
+    is cut off again. The chunk thus starts after a line break, as it does in the whole text,
+    and the kept break is a blank line wherever the whole pipeline leaves one (e.g. for a
+    '[3]' line removed at the start of the chunk).
+    """
+    written = 0
+    context = clean_pipeline(_STREAM_CONTEXT_LINE)
+    for chunk in iter_text_chunks(lines, chunk_size):
+        if written:
+            cleaned = clean_pipeline(_STREAM_CONTEXT_LINE + chunk)
+            if cleaned.startswith(context + '\n'):
+                cleaned = cleaned[len(context):]
+            elif cleaned != context:
+                cleaned = '\n' + clean_pipeline(chunk)
+            else:
+                cleaned = ''
+        else:
+            cleaned = clean_pipeline(chunk)
+        if not cleaned:
+            continue
+        out_file.write(cleaned)
+        written += len(cleaned)
+    return written
+
 # --- PDF Extraction (whole book) ---
 
-def extract_pdf_text_by_page(doc):
-    all_pages_text = []
-    for page_num in range(len(doc)):
-        page = doc.load_page(page_num)
-        page_height = page.rect.height
-        blocks = page.get_text("blocks", flags=fitz.TEXTFLAGS_TEXT)
-        filtered_lines = []
-        for block in blocks:
-            x0, y0, x1, y1, text, *_ = block
-            if y1 < HEADER_THRESHOLD or y0 > page_height - FOOTER_THRESHOLD:
-                continue
-            cleaned_block_text = re.sub(r'\s+', ' ', text).strip()
-            if cleaned_block_text:
-                filtered_lines.append(cleaned_block_text)
-        page_text = "\n".join(filtered_lines)
-        all_pages_text.append(page_text)
-    return all_pages_text
+_WHITESPACE_RE = re.compile(r'\s+')
+_DIGITS_RE = re.compile(r'\d+')
+
+def _extract_page_blocks(page):
+    """Return (page_height, [(y0, y1, text), ...]) for the non-empty text blocks of a page."""
+    blocks = []
+    for block in page.get_text("blocks", flags=fitz.TEXTFLAGS_TEXT):
+        x0, y0, x1, y1, text, *_ = block
+        cleaned_block_text = _WHITESPACE_RE.sub(' ', text).strip()
+        if cleaned_block_text:
+            blocks.append((y0, y1, cleaned_block_text))
+    return page.rect.height, blocks
+
+def _block_fingerprint(y0, y1, text, page_height):
+    # digits are masked so "Page 12"/"Page 13" match; the vertical band keeps the position
+    band = int(((y0 + y1) / 2) / page_height * HEADER_FOOTER_BANDS) if page_height else 0
+    return band, _DIGITS_RE.sub('#', text.lower())
+
+def _in_margin_zone(y0, y1, page_height):
+    center = (y0 + y1) / 2
+    return center < page_height * HEADER_FOOTER_ZONE or center > page_height * (1 - HEADER_FOOTER_ZONE)
+
+def strip_repeated_blocks(pages_blocks):
+    """Join each page's blocks into text, dropping running heads/feet.
+
+    A margin-zone block whose fingerprint (position band + digit-masked text) shows up on
+    more than HEADER_FOOTER_REPEAT_RATIO of the pages is treated as a header/footer, and so is
+    one repeated on HEADER_FOOTER_WINDOW_MIN pages within HEADER_FOOTER_WINDOW pages of it,
+    which catches running heads carrying the chapter title. Linear passes: collect the pages
+    of each fingerprint, sweep a window over them, then filter. Documents shorter than
+    HEADER_FOOTER_MIN_PAGES fall back to the fixed HEADER/FOOTER_THRESHOLD margins.
+    """
+    if len(pages_blocks) < HEADER_FOOTER_MIN_PAGES:
+        return ["\n".join(text for y0, y1, text in blocks
+                          if not (y1 < HEADER_THRESHOLD or y0 > page_height - FOOTER_THRESHOLD))
+                for page_height, blocks in pages_blocks]
+    fingerprint_pages = {}  # fingerprint -> ascending page numbers it appears on
+    for page_num, (page_height, blocks) in enumerate(pages_blocks):
+        fingerprints = {_block_fingerprint(y0, y1, text, page_height)
+                        for y0, y1, text in blocks if _in_margin_zone(y0, y1, page_height)}
+        for fingerprint in fingerprints:
+            fingerprint_pages.setdefault(fingerprint, []).append(page_num)
+    min_count = max(2, int(len(pages_blocks) * HEADER_FOOTER_REPEAT_RATIO) + 1)
+    repeated = set()  # fingerprints repeated across the document
+    repeated_locally = set()  # (page number, fingerprint) repeated on nearby pages
+    for fingerprint, pages in fingerprint_pages.items():
+        if len(pages) >= min_count:
+            repeated.add(fingerprint)
+            continue
+        low = high = 0
+        for page_num in pages:
+            while pages[low] < page_num - HEADER_FOOTER_WINDOW:
+                low += 1
+            while high + 1 < len(pages) and pages[high + 1] <= page_num + HEADER_FOOTER_WINDOW:
+                high += 1
+            if high - low + 1 >= HEADER_FOOTER_WINDOW_MIN:
+                repeated_locally.add((page_num, fingerprint))
+
+    def is_running_block(page_num, y0, y1, text, page_height):
+        if not _in_margin_zone(y0, y1, page_height):
+            return False
+        fingerprint = _block_fingerprint(y0, y1, text, page_height)
+        return fingerprint in repeated or (page_num, fingerprint) in repeated_locally
+
+    return ["\n".join(text for y0, y1, text in blocks if not is_running_block(page_num, y0, y1, text, page_height))
+            for page_num, (page_height, blocks) in enumerate(pages_blocks)]
+
+def _extract_pdf_page_range(args):
+    # worker: every process opens its own document, fitz handles can't be pickled
+    pdf_path, start, stop = args
+    doc = fitz.open(pdf_path)
+    try:
+        return [_extract_page_blocks(doc.load_page(page_num)) for page_num in range(start, stop)]
+    finally:
+        doc.close()
+
+def _split_page_ranges(page_count, workers, ranges_per_worker=4):
+    # a few ranges per worker so one dense chapter doesn't leave the others idle
+    chunk_size = max(1, -(-page_count // (workers * ranges_per_worker)))
+    return [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+
+def extract_pdf_text_by_page(doc, workers=1):
+    page_count = len(doc)
+    if workers <= 1 or page_count < 2 or not doc.name:
+        pages_blocks = [_extract_page_blocks(doc.load_page(page_num)) for page_num in range(page_count)]
+    else:
+        workers = min(workers, page_count)
+        tasks = [(doc.name, start, stop) for start, stop in _split_page_ranges(page_count, workers)]
+        pages_blocks = []
+        with Pool(processes=workers) as pool:
+            for range_blocks in pool.imap(_extract_pdf_page_range, tasks):
+                pages_blocks.extend(range_blocks)
+    return strip_repeated_blocks(pages_blocks)
+
+def _page_scan_details(page):
+    sentences = page.get_text().splitlines()
+    text = ". ".join([s for s in sentences if all(["copywrite" not in s, "permission" not in s, "reproduce" not in s])])
+    details = {
+        'text_length': len(text),
+        'image_count': len(page.get_images()),
+        'font_count': len(page.get_fonts()),
+    }
+    if details['text_length'] < 10 and details['image_count'] > 0:
+        is_scanned, confidence = True, 'High'
+    elif details['font_count'] == 0 and details['image_count'] > 0:
+        is_scanned, confidence = True, 'High'
+    elif details['text_length'] > 100 and details['font_count'] > 0:
+        is_scanned, confidence = False, 'High'
+    else:
+        is_scanned, confidence = False, 'Low'
+    return is_scanned, confidence, details
 
 def get_pdf_type(file_path):
     result = {
@@ -196,22 +691,7 @@ def get_pdf_type(file_path):
     try:
         doc = pymupdf.open(file_path)
         page = doc[0]
-        sentences = page.get_text().splitlines()
-        text = ". ".join([s for s in sentences if all(["copywrite" not in s, "permission" not in s, "reproduce" not in s])])
-        result['details']['text_length'] = len(text)
-        image_list = page.get_images()
-        result['details']['image_count'] = len(image_list)
-        fonts = page.get_fonts()
-        result['details']['font_count'] = len(fonts)
-        if len(text) < 10 and len(image_list) > 0:
-            result['is_scanned'] = True
-            result['confidence'] = 'High'
-        elif len(fonts) == 0 and len(image_list) > 0:
-            result['is_scanned'] = True
-            result['confidence'] = 'High'
-        elif len(text) > 100 and len(fonts) > 0:
-            result['is_scanned'] = False
-            result['confidence'] = 'High'
+        result['is_scanned'], result['confidence'], result['details'] = _page_scan_details(page)
         result['details']['rotation'] = page.rotation
         if page.rotation != 0 and result['is_scanned']:
             result['confidence'] = 'High'
@@ -221,29 +701,287 @@ def get_pdf_type(file_path):
         result['confidence'] = 'Low'
     return result
 
-def scanned_pdf(path):
-    print("  Converting from path ...")
-    pages = convert_from_path(path, dpi=300, use_pdftocairo=True)
-    out = []
-    total_pages = len(pages)
-    print(f"  Processing {total_pages} pages with OCR...")
-    for i, page in enumerate(pages, 1):
-        print(f"    OCR Progress: Page {i}/{total_pages} ({i*100//total_pages}%)", end='\r')
-        page_np = np.array(page)
-        height, width = page_np.shape[:2]
-        cropped_img = page_np[int(height * 0.1):int(height * 0.9), :]
-        gray_img = cv2.cvtColor(cropped_img, cv2.COLOR_RGB2GRAY)
-        _, binary_img = cv2.threshold(gray_img, 200, 255, cv2.THRESH_BINARY)
-        text = tess.image_to_string(binary_img, timeout=30)
-        lines = text.splitlines()
-        filtered_lines = [line for line in lines if not line.strip().isdigit() and "copyright" not in line.lower()]
-        filtered_text = " ".join(filtered_lines)
-        out.append(filtered_text)
+def _sample_page_numbers(page_count, sample_size):
+    if page_count <= sample_size:
+        return list(range(page_count))
+    step = (page_count - 1) / (sample_size - 1)
+    return sorted({round(i * step) for i in range(sample_size)})
+
+def get_pdf_page_types(file_path, sample_size=PAGE_SAMPLE_SIZE):
+    """Return a per-page list (0-based) of True for scanned pages, False for text pages.
+
+    Only sample_size evenly spaced pages are inspected when they all agree; a mixed sample
+    (e.g. born-digital cover on a scanned body) falls back to classifying every page.
+    """
+    doc = pymupdf.open(file_path)
+    try:
+        page_count = len(doc)
+        sample = _sample_page_numbers(page_count, sample_size)
+        sampled = {n: _page_scan_details(doc[n])[0] for n in sample}
+        if len(set(sampled.values())) <= 1:
+            uniform = next(iter(sampled.values()), False)
+            return [uniform] * page_count
+        return [sampled[n] if n in sampled else _page_scan_details(doc[n])[0] for n in range(page_count)]
+    finally:
+        doc.close()
+
+def set_ocr_preprocessing(**options):
+    """Choose OCR preprocessing stages for this process and any pool started afterwards."""
+    settings = ocr_preprocessing()
+    for name, value in options.items():
+        if name not in OCR_PREPROCESS_DEFAULTS:
+            raise ValueError(f"Unknown OCR preprocessing option: {name}")
+        if value is not None:
+            settings[name] = value
+    if settings['crop'] not in OCR_CROP_MODES:
+        raise ValueError(f"OCR crop must be one of {OCR_CROP_MODES}, got {settings['crop']!r}")
+    if settings['threshold'] not in OCR_THRESHOLD_MODES:
+        raise ValueError(f"OCR threshold must be one of {OCR_THRESHOLD_MODES}, got {settings['threshold']!r}")
+    os.environ[OCR_PREPROCESS_ENV] = json.dumps(settings, sort_keys=True)
+
+def ocr_preprocessing():
+    settings = dict(OCR_PREPROCESS_DEFAULTS)
+    if os.environ.get(OCR_PREPROCESS_ENV):
+        settings.update(json.loads(os.environ[OCR_PREPROCESS_ENV]))
+    return settings
+
+def set_keep_ocr_rasters(enabled):
+    """Keep page rasters between runs (for re-tuning OCR preprocessing) in this process and its pools."""
+    os.environ[OCR_KEEP_RASTERS_ENV] = "1" if enabled else "0"
+
+def keep_ocr_rasters_enabled():
+    return os.environ.get(OCR_KEEP_RASTERS_ENV) == "1"
+
+def _ink_mask(gray):
+    _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    return ink
+
+def _deskew(gray):
+    # skew of the minimum-area rectangle around all ink, normalised to (-45, 45]
+    points = cv2.findNonZero(_ink_mask(gray))
+    if points is None:
+        return gray
+    angle = cv2.minAreaRect(points)[-1]
+    if angle > 45:
+        angle -= 90
+    elif angle <= -45:
+        angle += 90
+    if abs(angle) < 0.1 or abs(angle) > OCR_MAX_SKEW:
+        return gray
+    height, width = gray.shape[:2]
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return cv2.warpAffine(gray, matrix, (width, height), flags=cv2.INTER_CUBIC,
+                          borderMode=cv2.BORDER_CONSTANT, borderValue=255)
+
+def _detect_crop(gray):
+    # bounding box of the ink after an opening, so scanner specks don't stretch it
+    ink = cv2.morphologyEx(_ink_mask(gray), cv2.MORPH_OPEN, np.ones((3, 3), np.uint8))
+    points = cv2.findNonZero(ink)
+    if points is None:
+        return gray
+    x, y, w, h = cv2.boundingRect(points)
+    margin = int(max(gray.shape[:2]) * OCR_CROP_MARGIN)
+    return gray[max(y - margin, 0):y + h + margin, max(x - margin, 0):x + w + margin]
+
+def preprocess_page_image(gray, settings):
+    """Grayscale page raster -> binary image for Tesseract: deskew, crop, denoise, threshold."""
+    if settings['deskew']:
+        gray = _deskew(gray)
+    if settings['crop'] == 'fixed':
+        height = gray.shape[0]
+        gray = gray[int(height * OCR_CROP[0]):int(height * OCR_CROP[1]), :]
+    elif settings['crop'] == 'detect':
+        gray = _detect_crop(gray)
+    if settings['denoise']:
+        gray = cv2.fastNlMeansDenoising(gray, None, OCR_DENOISE_STRENGTH)
+    if settings['threshold'] == 'adaptive':
+        return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY,
+                                     OCR_ADAPTIVE_BLOCK, OCR_ADAPTIVE_C)
+    if settings['threshold'] == 'otsu':
+        _, binary_img = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+        return binary_img
+    _, binary_img = cv2.threshold(gray, OCR_THRESHOLD, 255, cv2.THRESH_BINARY)
+    return binary_img
+
+def _ocr_page_image(gray, settings):
+    text = tess.image_to_string(preprocess_page_image(gray, settings), timeout=30)
+    lines = text.splitlines()
+    filtered_lines = [line for line in lines if not line.strip().isdigit() and "copyright" not in line.lower()]
+    return " ".join(filtered_lines)
+
+def _raster_path(raster_dir, page_num):
+    return os.path.join(raster_dir, f"page_{page_num:05d}.png")
+
+def _load_page_rasters(path, first_page, last_page, dpi, raster_dir=None):
+    """Grayscale rasters of pages first..last, read back from raster_dir when all are cached."""
+    page_numbers = range(first_page, last_page + 1)
+    if raster_dir and all(os.path.isfile(_raster_path(raster_dir, n)) for n in page_numbers):
+        cached = [cv2.imread(_raster_path(raster_dir, n), cv2.IMREAD_GRAYSCALE) for n in page_numbers]
+        if all(raster is not None for raster in cached):
+            return cached
+    pages = pdf2image.convert_from_path(path, dpi=dpi, first_page=first_page, last_page=last_page, use_pdftocairo=True)
+    rasters = []
+    for page in pages:
+        rasters.append(cv2.cvtColor(np.array(page), cv2.COLOR_RGB2GRAY))
+        page.close()
+    if raster_dir:
+        os.makedirs(raster_dir, exist_ok=True)
+        for page_num, raster in zip(page_numbers, rasters):
+            # PNG is lossless, so re-tuned runs see exactly the pixels a fresh rasterisation gives
+            tmp_path = _raster_path(raster_dir, page_num) + ".tmp.png"
+            cv2.imwrite(tmp_path, raster)
+            os.replace(tmp_path, _raster_path(raster_dir, page_num))
+    return rasters
+
+def _ocr_page_batch(args):
+    # worker: rasterise only this batch, so memory never holds more than batch_size pages
+    path, first_page, last_page, dpi, settings, raster_dir = args
+    rasters = _load_page_rasters(path, first_page, last_page, dpi, raster_dir)
+    return [(first_page + offset, _ocr_page_image(gray, settings)) for offset, gray in enumerate(rasters)]
+
+def _init_ocr_worker():
+    # one tesseract thread per process, the pool already provides the parallelism
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+def _page_batches(page_numbers, batch_size):
+    # group sorted page numbers into contiguous (first, last) runs of at most batch_size pages
+    batches = []
+    for page_num in sorted(page_numbers):
+        if batches and batches[-1][1] == page_num - 1 and page_num - batches[-1][0] < batch_size:
+            batches[-1][1] = page_num
+        else:
+            batches.append([page_num, page_num])
+    return batches
+
+def iter_ocr_pages(path, workers=1, batch_size=OCR_BATCH_SIZE, dpi=OCR_DPI, pages=None, settings=None,
+                   raster_dir=None):
+    """Yield (page_number, text) as batches finish, rasterising at most batch_size pages per worker.
+
+    With several workers batches arrive out of page order, so a slow page never holds back
+    the results behind it; callers key the texts by page number.
+
+    settings are the preprocessing stages (default: ocr_preprocessing()); with raster_dir,
+    page rasters are cached there and reused by later runs at the same dpi.
+    """
+    if pages is None:
+        pages = range(1, pdf2image.pdfinfo_from_path(path)["Pages"] + 1)
+    settings = settings or ocr_preprocessing()
+    tasks = [(path, first, last, dpi, settings, raster_dir) for first, last in _page_batches(pages, batch_size)]
+    if not tasks:
+        return
+    if workers <= 1:
+        for task in tasks:
+            yield from _ocr_page_batch(task)
+        return
+    with Pool(processes=min(workers, len(tasks)), initializer=_init_ocr_worker) as pool:
+        for batch in pool.imap_unordered(_ocr_page_batch, tasks):
+            yield from batch
+
+# --- OCR cache ---
+
+def file_content_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def ocr_settings_key(dpi=OCR_DPI, settings=None):
+    # the default pipeline keeps its original key, so existing caches stay valid
+    settings = settings or ocr_preprocessing()
+    crop = f"{OCR_CROP[0]}-{OCR_CROP[1]}" if settings['crop'] == 'fixed' else settings['crop']
+    threshold = {
+        'fixed': str(OCR_THRESHOLD),
+        'adaptive': f"adaptive{OCR_ADAPTIVE_BLOCK},{OCR_ADAPTIVE_C}",
+        'otsu': 'otsu',
+    }[settings['threshold']]
+    key = f"dpi={dpi};crop={crop};threshold={threshold}"
+    if settings['deskew']:
+        key += f";deskew={OCR_MAX_SKEW}"
+    if settings['denoise']:
+        key += f";denoise={OCR_DENOISE_STRENGTH}"
+    return key
+
+def open_ocr_cache(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS ocr_pages ("
+        " file_hash TEXT NOT NULL, page INTEGER NOT NULL, settings TEXT NOT NULL, text TEXT NOT NULL,"
+        " PRIMARY KEY (file_hash, page, settings))"
+    )
+    return conn
+
+def load_cached_ocr_pages(conn, file_hash, settings):
+    rows = conn.execute(
+        "SELECT page, text FROM ocr_pages WHERE file_hash = ? AND settings = ?", (file_hash, settings)
+    )
+    return dict(rows)
+
+def store_ocr_page(conn, file_hash, settings, page_num, text):
+    conn.execute(
+        "INSERT OR REPLACE INTO ocr_pages (file_hash, page, settings, text) VALUES (?, ?, ?, ?)",
+        (file_hash, page_num, settings, text)
+    )
+    conn.commit()
+
+def ocr_pdf_pages(path, pages=None, workers=1, batch_size=OCR_BATCH_SIZE, dpi=OCR_DPI, cache_path=None):
+    """OCR the given 1-based pages (all by default), reusing the cache; returns {page_number: text} in page order.
+
+    Page rasters are only cached with keep_ocr_rasters_enabled(); otherwise any left over
+    from an earlier run are deleted once OCR succeeded.
+    """
+    if pages is None:
+        pages = range(1, pdf2image.pdfinfo_from_path(path)["Pages"] + 1)
+    pages = list(pages)
+    page_texts = {}
+    conn = None
+    raster_dir = None
+    preprocess = ocr_preprocessing()
+    if cache_path:
+        conn = open_ocr_cache(cache_path)
+        file_hash = file_content_hash(path)
+        settings = ocr_settings_key(dpi, preprocess)
+        wanted = set(pages)
+        page_texts = {n: text for n, text in load_cached_ocr_pages(conn, file_hash, settings).items() if n in wanted}
+        if page_texts:
+            print(f"  Reusing {len(page_texts)} cached OCR pages from '{cache_path}'")
+        raster_dir = os.path.join(os.path.dirname(os.path.abspath(cache_path)), OCR_RASTER_DIR, f"{file_hash[:16]}_{dpi}")
+    keep_rasters = keep_ocr_rasters_enabled()
+    missing_pages = [n for n in pages if n not in page_texts]
+    print(f"  Processing {len(missing_pages)}/{len(pages)} pages with OCR ({workers} worker(s), batches of {batch_size})...")
+    try:
+        for done, (page_num, text) in enumerate(iter_ocr_pages(path, workers=workers, batch_size=batch_size, dpi=dpi, pages=missing_pages,
+                                                               settings=preprocess, raster_dir=raster_dir if keep_rasters else None), 1):
+            print(f"    OCR Progress: Page {page_num} ({done}/{len(missing_pages)}, {done*100//len(missing_pages)}%)", end='\r')
+            page_texts[page_num] = text
+            if conn:
+                store_ocr_page(conn, file_hash, settings, page_num, text)
+    finally:
+        if conn:
+            conn.close()
     print()
-    return ". ".join(out)
+    if raster_dir and not keep_rasters and os.path.isdir(raster_dir):
+        shutil.rmtree(raster_dir, ignore_errors=True)
+        try:
+            os.rmdir(os.path.dirname(raster_dir))  # only succeeds once no other book's rasters are left
+        except OSError:
+            pass
+    return dict(sorted(page_texts.items()))
+
+def scanned_pdf(path, workers=1, batch_size=OCR_BATCH_SIZE, dpi=OCR_DPI, cache_path=None):
+    page_texts = ocr_pdf_pages(path, workers=workers, batch_size=batch_size, dpi=dpi, cache_path=cache_path)
+    return ". ".join(page_texts[n] for n in sorted(page_texts))
 
 # --- EPUB Extraction ---
-def parse_epub_content(epub_path, progress_callback=None):
+def _clean_html_chapter(args):
+    # worker: errors come back as strings so one bad chapter doesn't abort the pool
+    index, html_content = args
+    try:
+        return index, clean_pipeline(basic_html_to_text(html_content)), None
+    except Exception as e:
+        return index, None, str(e)
+
+def parse_epub_content(epub_path, progress_callback=None, workers=1):
     chapters = []
     print(f"  Processing EPUB: '{os.path.basename(epub_path)}'")
     extracted_files_count = 0
@@ -252,7 +990,7 @@ def parse_epub_content(epub_path, progress_callback=None):
         with zipfile.ZipFile(epub_path, 'r') as epub_zip:
             opf_path = None
             container_xml = epub_zip.read('META-INF/container.xml').decode('utf-8')
-            container_soup = BeautifulSoup(container_xml, 'xml')
+            container_soup = bs4.BeautifulSoup(container_xml, 'xml')
             opf_relative_path = container_soup.find('rootfile')
             if opf_relative_path and opf_relative_path.get('full-path'):
                 opf_path = opf_relative_path.get('full-path')
@@ -273,7 +1011,7 @@ def parse_epub_content(epub_path, progress_callback=None):
             else:
                 print(f"  Found OPF file: '{opf_path}'")
                 opf_content = epub_zip.read(opf_path).decode('utf-8', errors='ignore')
-                opf_soup = BeautifulSoup(opf_content, 'xml')
+                opf_soup = bs4.BeautifulSoup(opf_content, 'xml')
                 manifest_items = {}
                 for item in opf_soup.find('manifest').find_all('item'):
                     item_id = item.get('id')
@@ -291,47 +1029,49 @@ def parse_epub_content(epub_path, progress_callback=None):
                 print(f"  Found {len(manifest_items)} manifest items and {len(spine_order_refs)} spine references.")
                 epub_base_path = os.path.dirname(opf_path) if '/' in opf_path else ''
 
-            toc_map = {}
-            nav_href = None
-            nav_item = opf_soup.find('item', {'properties': 'nav'}) if opf_soup else None
-            if nav_item:
-                nav_href = nav_item.get('href')
-            else:
-                spine_toc_id = spine.get('toc') if spine else None
-                if spine_toc_id and spine_toc_id in manifest_items:
-                    nav_href = manifest_items[spine_toc_id].get('href')
+            with PROFILER.stage('epub_toc'):
+                toc_map = {}
+                nav_href = None
+                nav_item = opf_soup.find('item', {'properties': 'nav'}) if opf_soup else None
+                if nav_item:
+                    nav_href = nav_item.get('href')
+                else:
+                    spine_toc_id = spine.get('toc') if spine else None
+                    if spine_toc_id and spine_toc_id in manifest_items:
+                        nav_href = manifest_items[spine_toc_id].get('href')
 
-            if nav_href:
-                try:
-                    nav_full_path = os.path.normpath(os.path.join(epub_base_path, nav_href)).replace('\\', '/')
-                    nav_content = epub_zip.read(nav_full_path).decode('utf-8', errors='ignore')
-                    nav_soup = BeautifulSoup(nav_content, 'lxml')
-                    nav_element = nav_soup.find('nav', {'epub:type': 'toc'}) or nav_soup.find('nav')
-                    if nav_element:
-                        print(f"  Parsing EPUB3 Nav TOC from '{nav_full_path}'...")
-                        for link in nav_element.find_all('a'):
-                            href = link.get('href')
-                            title = link.get_text(strip=True)
-                            if href:
-                                abs_href = os.path.normpath(os.path.join(os.path.dirname(nav_full_path), href)).replace('\\', '/')
-                                toc_map[abs_href.split('#')[0]] = title
-                    elif nav_soup.find('navMap'):
-                        print(f"  Parsing EPUB2 NCX TOC from '{nav_full_path}'...")
-                        for nav_point in nav_soup.find_all('navPoint'):
-                            content = nav_point.find('content')
-                            nav_label = nav_point.find('navLabel')
-                            if content and nav_label:
-                                src = content.get('src')
-                                title = nav_label.get_text(strip=True)
-                                if src:
-                                    abs_src = os.path.normpath(os.path.join(os.path.dirname(nav_full_path), src)).replace('\\', '/')
-                                    toc_map[abs_src.split('#')[0]] = title
-                except Exception as toc_e:
-                    print(f"    Warning: Could not parse TOC file '{nav_href}': {toc_e}")
+                if nav_href:
+                    try:
+                        nav_full_path = os.path.normpath(os.path.join(epub_base_path, nav_href)).replace('\\', '/')
+                        nav_content = epub_zip.read(nav_full_path).decode('utf-8', errors='ignore')
+                        nav_soup = bs4.BeautifulSoup(nav_content, 'lxml')
+                        nav_element = nav_soup.find('nav', {'epub:type': 'toc'}) or nav_soup.find('nav')
+                        if nav_element:
+                            print(f"  Parsing EPUB3 Nav TOC from '{nav_full_path}'...")
+                            for link in nav_element.find_all('a'):
+                                href = link.get('href')
+                                title = link.get_text(strip=True)
+                                if href:
+                                    abs_href = os.path.normpath(os.path.join(os.path.dirname(nav_full_path), href)).replace('\\', '/')
+                                    toc_map[abs_href.split('#')[0]] = title
+                        elif nav_soup.find('navMap'):
+                            print(f"  Parsing EPUB2 NCX TOC from '{nav_full_path}'...")
+                            for nav_point in nav_soup.find_all('navPoint'):
+                                content = nav_point.find('content')
+                                nav_label = nav_point.find('navLabel')
+                                if content and nav_label:
+                                    src = content.get('src')
+                                    title = nav_label.get_text(strip=True)
+                                    if src:
+                                        abs_src = os.path.normpath(os.path.join(os.path.dirname(nav_full_path), src)).replace('\\', '/')
+                                        toc_map[abs_src.split('#')[0]] = title
+                    except Exception as toc_e:
+                        print(f"    Warning: Could not parse TOC file '{nav_href}': {toc_e}")
 
             total_files_in_spine = len(spine_order_refs)
-            processed_spine_files = 0
 
+            # decode every chapter up front, the zip handle stays in this process
+            spine_chapters = []
             for i, idref in enumerate(spine_order_refs):
                 item = manifest_items.get(idref)
                 if not item:
@@ -350,29 +1090,45 @@ def parse_epub_content(epub_path, progress_callback=None):
                     relative_href = item.get('href')
                     content_path = os.path.normpath(os.path.join(epub_base_path, relative_href)).replace('\\', '/')
 
-                if progress_callback:
-                    progress_callback(10 + int((processed_spine_files / max(1, total_files_in_spine)) * 80))
-
                 try:
                     html_content = epub_zip.read(content_path).decode('utf-8', errors='ignore')
-                    print(f"    [{processed_spine_files+1}/{total_files_in_spine}] Reading: '{content_path}'")
-                    raw_text = basic_html_to_text(html_content)
-                    cleaned_text = clean_pipeline(raw_text)
-                    if cleaned_text:
-                        chapter_title = toc_map.get(content_path, os.path.basename(relative_href))
-                        chapters.append({
-                            'title': chapter_title,
-                            'text': cleaned_text
-                        })
-                        extracted_files_count += 1
-                    else:
-                        print(f"      No text content extracted from '{content_path}'.")
-                    processed_spine_files += 1
-
+                    print(f"    [{len(spine_chapters)+1}/{total_files_in_spine}] Reading: '{content_path}'")
+                    spine_chapters.append((content_path, relative_href, html_content))
                 except KeyError:
                     print(f"    Error: File path not found in zip for idref '{idref}': '{content_path}'")
                 except Exception as e:
-                    print(f"    Error processing content file '{content_path}': {e}")
+                    print(f"    Error reading content file '{content_path}': {e}")
+
+            cleaned_results = [None] * len(spine_chapters)
+            tasks = [(index, html_content) for index, (_, _, html_content) in enumerate(spine_chapters)]
+            print(f"  Cleaning {len(tasks)} chapters ({workers} worker(s))...")
+
+            def collect(results):
+                for done, (index, cleaned_text, error) in enumerate(results, 1):
+                    cleaned_results[index] = (cleaned_text, error)
+                    if progress_callback:
+                        progress_callback(10 + int((done / max(1, len(tasks))) * 80))
+
+            with PROFILER.stage('epub_chapters', chars_in=sum(len(t[1]) for t in tasks)) as stage:
+                if workers <= 1 or len(tasks) < 2:
+                    collect(map(_clean_html_chapter, tasks))
+                else:
+                    with Pool(processes=min(workers, len(tasks))) as pool:
+                        collect(pool.imap_unordered(_clean_html_chapter, tasks))
+                stage['chars_out'] = sum(len(r[0] or '') for r in cleaned_results)
+
+            for (content_path, relative_href, _), (cleaned_text, error) in zip(spine_chapters, cleaned_results):
+                if error:
+                    print(f"    Error processing content file '{content_path}': {error}")
+                elif cleaned_text:
+                    chapter_title = toc_map.get(content_path, os.path.basename(relative_href))
+                    chapters.append({
+                        'title': chapter_title,
+                        'text': cleaned_text
+                    })
+                    extracted_files_count += 1
+                else:
+                    print(f"      No text content extracted from '{content_path}'.")
 
             print(f"  Successfully extracted text from {extracted_files_count} content files.")
             if progress_callback:
@@ -396,20 +1152,186 @@ def extract_txt(path):
 # --- saving eunctions ---
 
 def save_whole_book_text(full_text, book_name, output_dir):
+    """Clean and write the book text; returns True once it is completely on disk."""
     os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, f"{book_name}_full_text.txt")
+    output_file = _output_text_path(output_dir, book_name)
     print(f"  Cleaning full text...")
     cleaned_full_text = clean_pipeline(full_text)
     print(f"  Saving full text to '{output_file}'...")
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(cleaned_full_text)
+        with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            with PROFILER.stage('write', chars_in=len(cleaned_full_text)):
+                f.write(cleaned_full_text)
         print(f"  Full text saved.")
+        return True
+    except Exception as e:
+        print(f"  Error saving full text: {e}")
+        return False
+
+
+def _iter_page_lines(pages):
+    for page_text in pages:
+        yield from (page_text + '\n').splitlines(keepends=True)
+
+def save_book_text_stream(lines, book_name, output_dir, chunk_size=STREAM_CHUNK_SIZE):
+    """Clean and write the book text chunk by chunk; returns True once it is completely on disk."""
+    os.makedirs(output_dir, exist_ok=True)
+    output_file = _output_text_path(output_dir, book_name)
+    print(f"  Cleaning and saving full text in chunks of {chunk_size} characters to '{output_file}'...")
+    try:
+        with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            written = clean_pipeline_stream(lines, f, chunk_size)
+        print(f"  Full text saved ({written} characters).")
+        return True
     except Exception as e:
         print(f"  Error saving full text: {e}")
+        return False
+
+
+def _output_index_path(output_dir, book_name):
+    return os.path.join(output_dir, f"{book_name}_index.json")
+
+def save_chapter_text(chapters, book_name, output_dir):
+    """Write already-cleaned chapters as one text file plus a chapter index.
+
+    The index lists each chapter's title, byte offset/length in the UTF-8 text file and
+    word offset/count, so readers can seek straight to chapter N. Returns True once both
+    files are completely on disk.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    output_file = _output_text_path(output_dir, book_name)
+    index_file = _output_index_path(output_dir, book_name)
+    separator = "\n\n"
+    separator_bytes = len(separator.encode('utf-8'))
+    entries = []
+    byte_offset = 0
+    word_offset = 0
+    print(f"  Saving {len(chapters)} chapters to '{output_file}' with index '{index_file}'...")
+    try:
+        # newline='' keeps '\n' as one byte on Windows too, otherwise the byte offsets drift
+        with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            for number, chapter in enumerate(chapters):
+                text = chapter['text']
+                if number:
+                    f.write(separator)
+                    byte_offset += separator_bytes
+                f.write(text)
+                byte_length = len(text.encode('utf-8'))
+                word_count = len(text.split())
+                entries.append({
+                    'title': chapter['title'],
+                    'byte_offset': byte_offset,
+                    'byte_length': byte_length,
+                    'word_offset': word_offset,
+                    'word_count': word_count,
+                })
+                byte_offset += byte_length
+                word_offset += word_count
+        with open(index_file, 'w', encoding='utf-8') as f:
+            json.dump({'text_file': os.path.basename(output_file), 'chapters': entries},
+                      f, ensure_ascii=False, separators=(',', ':'))
+        print("  Chapter text and index saved.")
+        return True
+    except Exception as e:
+        print(f"  Error saving chapter text: {e}")
+        return False
+
+def _write_single_chapter_index(output_file, index_file, title):
+    # formats without chapter structure get a one-entry index, so readers can treat all books alike
+    with MappedTextSource(output_file, errors="ignore") as source:
+        word_count = sum(1 for _ in source.iter_tokens())
+    entry = {'title': title, 'byte_offset': 0, 'byte_length': os.path.getsize(output_file),
+             'word_offset': 0, 'word_count': word_count}
+    with open(index_file, 'w', encoding='utf-8') as f:
+        json.dump({'text_file': os.path.basename(output_file), 'chapters': [entry]},
+                  f, ensure_ascii=False, separators=(',', ':'))
+
+def _pdf_chapters(doc, all_pages_text):
+    """Split raw page texts into cleaned chapters along the PDF's top-level outline."""
+    toc = doc.get_toc(simple=True)
+    top_level = min((entry[0] for entry in toc), default=None)
+    # outlines can be out of order, repeat a page or point past the end; keep one start per page
+    starts = []
+    for level, title, page in sorted(toc, key=lambda entry: entry[2]):
+        if level == top_level and 1 <= page <= len(all_pages_text) and (not starts or starts[-1][1] != page - 1):
+            starts.append((title, page - 1))
+    if not starts or starts[0][1] > 0:
+        starts.insert(0, ("Front matter", 0))
+    chapters = []
+    for number, (title, first_page) in enumerate(starts):
+        last_page = starts[number + 1][1] if number + 1 < len(starts) else len(all_pages_text)
+        cleaned = clean_pipeline("\n".join(all_pages_text[first_page:last_page]))
+        if cleaned:
+            chapters.append({'title': title, 'text': cleaned})
+    return chapters
 
 
-def extract_book(file_path, output_dir="extracted_books", progress_callback=None):
+# --- Extraction manifest ---
+
+def _output_text_path(output_dir, book_name):
+    return os.path.join(output_dir, f"{book_name}_full_text.txt")
+
+def _safe_book_name(file_path):
+    book_name_base = os.path.splitext(os.path.basename(file_path))[0]
+    safe_book_name = re.sub(r'[^\w\s-]', '', book_name_base).strip().replace(' ', '_')
+    return safe_book_name or "unnamed_book"
+
+def load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_manifest(file_path, output_dir, output_file, file_hash=None, used_ocr=False):
+    stat = os.stat(file_path)
+    manifest = {
+        'source': os.path.abspath(file_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': file_hash or file_content_hash(file_path),
+        'pipeline_version': PIPELINE_VERSION,
+        'tts': tts_mode_enabled(),
+        'ocr_settings': ocr_settings_key() if used_ocr else None,  # None: no page went through OCR
+        'output_file': os.path.basename(output_file),
+    }
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def is_up_to_date(file_path, output_dir):
+    """True if output_dir holds output built from this exact input by the current pipeline.
+
+    Size and mtime are checked first; the content hash is only computed when they changed,
+    and a matching hash just refreshes the recorded mtime (e.g. after a copy or touch).
+    """
+    manifest = load_manifest(output_dir)
+    if not manifest or manifest.get('pipeline_version') != PIPELINE_VERSION:
+        return False
+    if manifest.get('source') != os.path.abspath(file_path):
+        return False
+    if manifest.get('tts', False) != tts_mode_enabled():
+        return False
+    # only books that went through OCR depend on the preprocessing settings
+    if manifest.get('ocr_settings') is not None and manifest['ocr_settings'] != ocr_settings_key():
+        return False
+    if not os.path.isfile(os.path.join(output_dir, manifest.get('output_file', ''))):
+        return False
+    stat = os.stat(file_path)
+    if manifest.get('size') == stat.st_size and manifest.get('mtime_ns') == stat.st_mtime_ns:
+        return True
+    if manifest.get('size') != stat.st_size:
+        return False
+    file_hash = file_content_hash(file_path)
+    if file_hash != manifest.get('sha256'):
+        return False
+    write_manifest(file_path, output_dir, manifest['output_file'], file_hash,
+                   used_ocr=manifest.get('ocr_settings') is not None)
+    return True
+
+
+def extract_book(file_path, output_dir="extracted_books", progress_callback=None, workers=1, force=False,
+                 chapters=False):
     start_time = time.time()
     if progress_callback:
         progress_callback(0)
@@ -418,30 +1340,49 @@ def extract_book(file_path, output_dir="extracted_books", progress_callback=None
         raise FileNotFoundError(f"Input file not found: '{file_path}'")
 
     file_ext = os.path.splitext(file_path)[1].lower()
-    book_name_base = os.path.splitext(os.path.basename(file_path))[0]
-    safe_book_name = re.sub(r'[^\w\s-]', '', book_name_base).strip().replace(' ', '_')
-    if not safe_book_name:
-        safe_book_name = "unnamed_book"
+    safe_book_name = _safe_book_name(file_path)
 
     os.makedirs(output_dir, exist_ok=True)
     absolute_output_dir = os.path.abspath(output_dir)
+    output_file = _output_text_path(absolute_output_dir, safe_book_name)
+    index_file = _output_index_path(absolute_output_dir, safe_book_name)
+
+    if not force and (not chapters or os.path.isfile(index_file)) and is_up_to_date(file_path, absolute_output_dir):
+        print(f"--- Up to date, skipping: {os.path.basename(file_path)} ---")
+        if progress_callback: progress_callback(100)
+        return absolute_output_dir
 
     print(f"--- Starting Whole Extraction for: {os.path.basename(file_path)} ---")
     print(f"    Output directory    : {absolute_output_dir}")
+    for stale_file in (index_file, os.path.join(absolute_output_dir, MANIFEST_FILE)):
+        if os.path.isfile(stale_file):
+            os.remove(stale_file)  # never leave an index or manifest describing a half-rewritten text
 
+    saved = False
+    used_ocr = False
     try:
         if file_ext == '.pdf':
             print("  Processing PDF file (whole mode)...")
             if progress_callback: progress_callback(5)
-            pdf_type = get_pdf_type(file_path)
-            print(f"  PDF Type Analysis: Scanned={pdf_type['is_scanned']}")
+            with PROFILER.stage('pdf_classify') as stage:
+                page_types = get_pdf_page_types(file_path)
+                stage['pages'] = len(page_types)
+            scanned_pages = [n + 1 for n, is_scanned in enumerate(page_types) if is_scanned]
+            print(f"  PDF Type Analysis: {len(scanned_pages)}/{len(page_types)} scanned pages")
+            ocr_cache_path = os.path.join(absolute_output_dir, OCR_CACHE_FILE)
 
-            if pdf_type['is_scanned']:
+            if page_types and len(scanned_pages) == len(page_types):
                 if progress_callback: progress_callback(30)
-                doc_text = scanned_pdf(file_path)
+                with PROFILER.stage('ocr') as stage:
+                    doc_text = scanned_pdf(file_path, workers=workers, cache_path=ocr_cache_path)
+                    stage['pages'] = len(page_types)
+                    stage['chars_out'] = len(doc_text)
                 print("  Performed OCR on scanned PDF.")
                 if progress_callback: progress_callback(70)
-                save_whole_book_text(doc_text, safe_book_name, absolute_output_dir)
+                if save_whole_book_text(doc_text, safe_book_name, absolute_output_dir):
+                    if chapters:
+                        _write_single_chapter_index(output_file, index_file, safe_book_name)
+                    write_manifest(file_path, absolute_output_dir, output_file, used_ocr=True)
                 if progress_callback: progress_callback(100)
                 elapsed_time = time.time() - start_time
                 print(f"--- Extraction completed in {elapsed_time:.2f} seconds ---")
@@ -450,39 +1391,69 @@ def extract_book(file_path, output_dir="extracted_books", progress_callback=None
             doc = fitz.open(file_path)
             print(f"  Opened PDF. Pages: {len(doc)}")
             if progress_callback: progress_callback(10)
-            all_pages_text = extract_pdf_text_by_page(doc)
-            print(f"  Extracted raw text from {len(all_pages_text)} pages.")
+            with PROFILER.stage('pdf_text') as stage:
+                all_pages_text = extract_pdf_text_by_page(doc, workers=workers)
+                stage['pages'] = len(all_pages_text)
+                stage['chars_out'] = sum(len(page_text) for page_text in all_pages_text)
+            print(f"  Extracted raw text from {len(all_pages_text)} pages ({workers} worker(s)).")
+            if scanned_pages:
+                used_ocr = True
+                print(f"  Mixed PDF: OCR only for {len(scanned_pages)} scanned pages.")
+                with PROFILER.stage('ocr') as stage:
+                    ocr_texts = ocr_pdf_pages(file_path, pages=scanned_pages, workers=workers, cache_path=ocr_cache_path)
+                    stage['pages'] = len(scanned_pages)
+                for page_num, text in ocr_texts.items():
+                    all_pages_text[page_num - 1] = text
             if progress_callback: progress_callback(60)
-            full_text = "\n".join(all_pages_text)
-            save_whole_book_text(full_text, safe_book_name, absolute_output_dir)
+            if chapters:
+                saved = save_chapter_text(_pdf_chapters(doc, all_pages_text), safe_book_name, absolute_output_dir)
+            elif sum(len(page_text) for page_text in all_pages_text) > STREAM_THRESHOLD:
+                saved = save_book_text_stream(_iter_page_lines(all_pages_text), safe_book_name, absolute_output_dir)
+            else:
+                full_text = "\n".join(all_pages_text)
+                saved = save_whole_book_text(full_text, safe_book_name, absolute_output_dir)
             doc.close()
             if progress_callback: progress_callback(95)
 
         elif file_ext == '.epub':
             print("  Processing EPUB file (whole mode)...")
-            epub_chapters = parse_epub_content(file_path, progress_callback)
+            with PROFILER.stage('epub_parse'):
+                epub_chapters = parse_epub_content(file_path, progress_callback, workers=workers)
             if not epub_chapters:
                 print("  Warning: No content extracted from EPUB.")
-            if epub_chapters:
+            if epub_chapters and chapters:
+                saved = save_chapter_text(epub_chapters, safe_book_name, absolute_output_dir)
+            elif epub_chapters:
                 print("  Combining EPUB chapters into whole book text...")
                 full_text = "\n\n".join([chap['text'] for chap in epub_chapters if chap.get('text')])
-                save_whole_book_text(full_text, safe_book_name, absolute_output_dir)
+                saved = save_whole_book_text(full_text, safe_book_name, absolute_output_dir)
             else:
                 print("  No EPUB content extracted; nothing to save.")
 
         elif file_ext == '.txt':
-            print("  Processing TXT file (whole mode)...")
-            txt_content = extract_txt(file_path)
-            save_whole_book_text(txt_content, safe_book_name, absolute_output_dir)
+            if os.path.getsize(file_path) > STREAM_THRESHOLD:
+                print("  Processing TXT file (streaming mode)...")
+                with MappedTextSource(file_path, errors="ignore") as source:
+                    saved = save_book_text_stream(source.iter_lines(), safe_book_name, absolute_output_dir)
+            else:
+                print("  Processing TXT file (whole mode)...")
+                with PROFILER.stage('read_txt') as stage:
+                    txt_content = extract_txt(file_path)
+                    stage['chars_out'] = len(txt_content)
+                saved = save_whole_book_text(txt_content, safe_book_name, absolute_output_dir)
 
         elif file_ext in ('.html', '.htm'):
             print("  Processing HTML file (whole mode)...")
             content = basic_html_to_text(open(file_path, 'r', encoding='utf-8', errors='ignore').read())
-            save_whole_book_text(content, safe_book_name, absolute_output_dir)
+            saved = save_whole_book_text(content, safe_book_name, absolute_output_dir)
 
         else:
             raise ValueError(f"Unsupported file format: '{file_ext}'. Supported: .pdf, .epub, .txt, .html, .htm")
 
+        if saved:
+            if chapters and not os.path.isfile(index_file):
+                _write_single_chapter_index(output_file, index_file, safe_book_name)
+            write_manifest(file_path, absolute_output_dir, output_file, used_ocr=used_ocr)
         elapsed_time = time.time() - start_time
         print(f"--- Extraction completed in {elapsed_time:.2f} seconds ---")
         if progress_callback: progress_callback(100)
@@ -494,9 +1465,8 @@ def extract_book(file_path, output_dir="extracted_books", progress_callback=None
         if progress_callback: progress_callback(None)
         raise
 
-def extract(file_path: str, output_base: str) -> str:
-    book_base_name = os.path.splitext(os.path.basename(file_path))[0]
-    specific_output_dir = os.path.join(output_base, book_base_name)
+def extract(file_path: str, output_base: str, workers: int = 1, force: bool = False, chapters: bool = False) -> str:
+    specific_output_dir = book_output_dir(file_path, output_base)
     if not os.path.exists(file_path):
         print(f"Test file not found: {file_path}")
         sys.exit(1)
@@ -515,7 +1485,8 @@ def extract(file_path: str, output_base: str) -> str:
     try:
         print(f"Running whole extraction on: {file_path}")
         print(f"Output will be in:   {specific_output_dir}")
-        result_dir = extract_book(file_path=file_path, output_dir=specific_output_dir, progress_callback=sample_progress)
+        with PROFILER.stage('extract_book'):
+            result_dir = extract_book(file_path=file_path, output_dir=specific_output_dir, progress_callback=sample_progress, workers=workers, force=force, chapters=chapters)
         print(f"\nExtraction successful. Output saved in: {result_dir}")
         return result_dir
     except Exception as e:
@@ -523,13 +1494,279 @@ def extract(file_path: str, output_base: str) -> str:
         sys.exit(1)
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python extract.py <file_path>")
+# --- Batch extraction ---
+
+def collect_input_files(patterns):
+    """Expand files, directories (recursively) and glob patterns into supported book paths."""
+    found = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            candidates = (os.path.join(root, name) for root, _, names in os.walk(pattern) for name in names)
+        elif glob.has_magic(pattern):
+            candidates = glob.iglob(pattern, recursive=True)
+        else:
+            candidates = [pattern]
+        for path in candidates:
+            if os.path.isfile(path) and os.path.splitext(path)[1].lower() in SUPPORTED_EXTENSIONS:
+                found.append(os.path.abspath(path))
+    return list(dict.fromkeys(found))
+
+def _count_pages(file_path):
+    if os.path.splitext(file_path)[1].lower() != '.pdf':
+        return None
+    try:
+        with fitz.open(file_path) as doc:
+            return len(doc)
+    except Exception:
+        return None
+
+def book_output_dir(file_path, output_base, taken=()):
+    """Output directory of one book: output_base/<file name>_<extension>, e.g. out/book_pdf.
+
+    The name follows from the input alone, so a book keeps its folder however it is batched,
+    and book.pdf and book.epub never share one. A folder whose manifest already records this
+    source is reused, which also keeps outputs of the older output_base/<file name> layout.
+    Same-named inputs from different folders (a/book.pdf, b/book.pdf) get a short hash of
+    their absolute path appended. taken holds lowercase folder names already handed out in
+    this run.
+    """
+    source = os.path.abspath(file_path)
+    stem, extension = os.path.splitext(os.path.basename(file_path))
+    name = f"{stem}_{extension.lstrip('.').lower()}"
+    hashed_name = f"{name}_{hashlib.sha1(source.encode('utf-8')).hexdigest()[:8]}"
+    for candidate in (name, hashed_name, stem):
+        manifest = load_manifest(os.path.join(output_base, candidate))
+        if manifest and manifest.get('source') == source:
+            return os.path.join(output_base, candidate)
+    claimed = load_manifest(os.path.join(output_base, name)) is not None or name.lower() in taken
+    return os.path.join(output_base, hashed_name if claimed else name)
+
+def book_output_dirs(files, output_base):
+    """Map each book path to book_output_dir(), planned together so no two books share a folder."""
+    dirs = {}
+    taken = set()
+    for path in files:
+        dirs[path] = book_output_dir(path, output_base, taken)
+        taken.add(os.path.basename(dirs[path]).lower())
+    return dirs
+
+def batch_extract_one(args):
+    # worker: one whole book per task; pool workers are daemonic, so no nested page pools
+    file_path, book_output_dir, force, chapters = args
+    result = {
+        'file': file_path,
+        'size_bytes': os.path.getsize(file_path),
+        'pages': _count_pages(file_path),
+        'output_dir': None,
+        'skipped': False,
+        'seconds': None,
+        'error': None,
+    }
+    start = time.perf_counter()
+    try:
+        result['skipped'] = (not force and (not chapters or os.path.isfile(_output_index_path(book_output_dir, _safe_book_name(file_path))))
+                             and is_up_to_date(file_path, book_output_dir))
+        result['output_dir'] = extract_book(file_path, output_dir=book_output_dir, force=force, chapters=chapters)
+        if load_manifest(result['output_dir']) is None:
+            result['error'] = "no output saved"  # the manifest is only written after a complete save
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+def extract_batch(patterns, output_base, workers=1, summary_path=None, force=False, chapters=False):
+    files = collect_input_files(patterns)
+    # largest first, so a huge book doesn't start last and stretch the tail of the run
+    files.sort(key=os.path.getsize, reverse=True)
+    print(f"Batch extraction: {len(files)} file(s), {workers} worker(s)")
+    start = time.perf_counter()
+    output_dirs = book_output_dirs(files, output_base)
+    # folders named <name>_<extension>_<hash>: another input has the same file name
+    hashed = [path for path in files if len(os.path.basename(output_dirs[path])) > len(os.path.basename(path)) + 1]
+    if hashed:
+        print(f"  {len(hashed)} file(s) share a file name with another book, their output folders get a path hash:")
+        for path in hashed:
+            print(f"    {path} -> {output_dirs[path]}")
+    tasks = [(path, output_dirs[path], force, chapters) for path in files]
+    results = []
+    if workers <= 1:
+        results = [batch_extract_one(task) for task in tasks]
+    else:
+        with Pool(processes=min(workers, max(1, len(tasks)))) as pool:
+            for result in pool.imap_unordered(batch_extract_one, tasks):
+                results.append(result)
+                status = "FAILED" if result['error'] else "skipped" if result['skipped'] else "ok"
+                print(f"[{len(results)}/{len(tasks)}] {status} {os.path.basename(result['file'])} ({result['seconds']}s)")
+    failures = [r for r in results if r['error']]
+    summary = {
+        'total_files': len(results),
+        'succeeded': len(results) - len(failures),
+        'skipped': sum(1 for r in results if r['skipped']),
+        'failed': len(failures),
+        'workers': workers,
+        'elapsed_seconds': round(time.perf_counter() - start, 3),
+        'files': sorted(results, key=lambda r: r['file']),
+    }
+    os.makedirs(output_base, exist_ok=True)
+    summary_path = summary_path or os.path.join(output_base, "batch_summary.json")
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    print(f"Batch finished: {summary['succeeded']} ok ({summary['skipped']} up to date), "
+          f"{summary['failed']} failed in {summary['elapsed_seconds']}s")
+    print(f"Summary written to '{summary_path}'")
+    return summary
+
+
+def benchmark_pdf_extraction(file_path: str, workers: int, repeats: int = 3):
+    timings = {}
+    results = {}
+    for label, n in (("serial", 1), (f"parallel ({workers} workers)", workers)):
+        best = float('inf')
+        for _ in range(repeats):
+            doc = fitz.open(file_path)
+            start = time.perf_counter()
+            results[label] = extract_pdf_text_by_page(doc, workers=n)
+            best = min(best, time.perf_counter() - start)
+            doc.close()
+        timings[label] = best
+    serial_time = timings["serial"]
+    page_count = len(results["serial"])
+    print(f"Benchmark: {os.path.basename(file_path)} ({page_count} pages, best of {repeats})")
+    for label, elapsed in timings.items():
+        pages_per_sec = page_count / elapsed if elapsed else float('inf')
+        print(f"  {label:<28} {elapsed:8.3f}s  {pages_per_sec:8.1f} pages/s  x{serial_time / elapsed:.2f}")
+    identical = len(set(tuple(r) for r in results.values())) == 1
+    print(f"  Outputs identical: {identical}")
+    return timings
+
+
+def _read_html_documents(file_path):
+    if os.path.splitext(file_path)[1].lower() == '.epub':
+        with zipfile.ZipFile(file_path, 'r') as epub_zip:
+            return [epub_zip.read(name).decode('utf-8', errors='ignore')
+                    for name in sorted(epub_zip.namelist()) if name.lower().endswith(('.html', '.xhtml', '.htm'))]
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        return [f.read()]
+
+
+def benchmark_html_backends(file_path, repeats=3):
+    documents = _read_html_documents(file_path)
+    size_mb = sum(len(d.encode('utf-8')) for d in documents) / (1024 * 1024)
+    reference = [basic_html_to_text(d, backend='bs4') for d in documents]
+    print(f"Benchmark: basic_html_to_text on {len(documents)} document(s), {size_mb:.2f} MB (best of {repeats})")
+    timings = {}
+    matches = {}
+    for backend in HTML_TO_TEXT_BACKENDS:
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            outputs = [basic_html_to_text(d, backend=backend) for d in documents]
+            best = min(best, time.perf_counter() - start)
+        timings[backend] = best
+        matches[backend] = sum(1 for out, ref in zip(outputs, reference) if out == ref)
+    for backend, elapsed in timings.items():
+        print(f"  {backend:<8} {elapsed:8.3f}s  {size_mb / elapsed if elapsed else float('inf'):8.2f} MB/s  "
+              f"x{timings['bs4'] / elapsed:.2f} vs bs4  identical to bs4: {matches[backend]}/{len(documents)}")
+    return timings
+
+
+def _read_raw_text(file_path):
+    file_ext = os.path.splitext(file_path)[1].lower()
+    if file_ext == '.epub':
+        return "\n\n".join(basic_html_to_text(d) for d in _read_html_documents(file_path))
+    if file_ext == '.pdf':
+        doc = fitz.open(file_path)
+        try:
+            return "\n".join(extract_pdf_text_by_page(doc))
+        finally:
+            doc.close()
+    if file_ext in ('.html', '.htm'):
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            return basic_html_to_text(f.read())
+    if file_ext == '.txt':
+        return extract_txt(file_path)
+    raise ValueError(f"Unsupported file format for cleaning benchmark: '{file_ext}'")
+
+
+def benchmark_clean_pipeline(text, repeats=3):
+    size_mb = len(text.encode('utf-8')) / (1024 * 1024)
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        clean_pipeline(text)
+        best = min(best, time.perf_counter() - start)
+    print(f"Benchmark: clean_pipeline on {size_mb:.2f} MB (best of {repeats})")
+    print(f"  {best:8.3f}s  {size_mb / best if best else float('inf'):8.2f} MB/s")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract and clean text from PDF, EPUB, TXT and HTML books.")
+    parser.add_argument("paths", nargs='+',
+                        help="Book file to extract, or several files, directories and glob patterns for batch mode")
+    parser.add_argument("--output", default="output", help="Base output directory (default: output)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes: pages, OCR batches or EPUB chapters for one book, whole books in batch mode (0 = all cores, default: 1)")
+    parser.add_argument("--summary", default=None,
+                        help="Batch mode JSON summary path (default: <output>/batch_summary.json)")
+    parser.add_argument("--chapters", action="store_true",
+                        help="Also write <book>_index.json with chapter titles, byte and word offsets")
+    parser.add_argument("--tts", action="store_true",
+                        help="TTS-oriented export: verbalise numbers (1999 -> nineteen ninety-nine, 3rd -> third)")
+    parser.add_argument("--ocr-deskew", action="store_true", help="OCR: straighten skewed scans before recognition")
+    parser.add_argument("--ocr-crop", choices=OCR_CROP_MODES, default=None,
+                        help="OCR: keep the fixed 10%%-90%% band, detect the content box, or keep the whole page (default: fixed)")
+    parser.add_argument("--ocr-denoise", action="store_true", help="OCR: non-local means denoising before thresholding")
+    parser.add_argument("--ocr-threshold", choices=OCR_THRESHOLD_MODES, default=None,
+                        help=f"OCR: fixed level {OCR_THRESHOLD}, adaptive (uneven lighting) or Otsu (default: fixed)")
+    parser.add_argument("--keep-ocr-rasters", action="store_true",
+                        help=f"OCR: keep page rasters in <output>/<book>/{OCR_RASTER_DIR}, so runs with other --ocr-* options skip rasterising")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-extract even if the manifest says the output is up to date")
+    parser.add_argument("--profile", metavar="REPORT_JSON", default=None,
+                        help="Write per-stage/per-cleaning-step timings to REPORT_JSON (+ .folded collapsed stacks); "
+                             "steps that run inside worker processes are only timed with --workers 1")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Time PDF page extraction (serial vs parallel), HTML backends and clean_pipeline throughput instead of extracting")
+    args = parser.parse_args()
+
+    workers = args.workers if args.workers > 0 else cpu_count()
+    if args.tts:
+        set_tts_mode(True)
+    if args.ocr_deskew or args.ocr_crop or args.ocr_denoise or args.ocr_threshold:
+        set_ocr_preprocessing(deskew=args.ocr_deskew or None, crop=args.ocr_crop, denoise=args.ocr_denoise or None,
+                              threshold=args.ocr_threshold)
+    if args.keep_ocr_rasters:
+        set_keep_ocr_rasters(True)
+    if args.profile:
+        PROFILER.enabled = True
+    single_file = len(args.paths) == 1 and not os.path.isdir(args.paths[0]) and not glob.has_magic(args.paths[0])
+    if args.benchmark:
+        if not single_file:
+            print("Benchmark mode takes a single file.")
+            sys.exit(1)
+        file_path = args.paths[0]
+        if os.path.splitext(file_path)[1].lower() == '.pdf':
+            benchmark_pdf_extraction(file_path, workers if workers > 1 else cpu_count())
+        if os.path.splitext(file_path)[1].lower() in ('.epub', '.html', '.htm'):
+            benchmark_html_backends(file_path)
+        benchmark_clean_pipeline(_read_raw_text(file_path))
+        return
+    if single_file:
+        extract(args.paths[0], args.output, workers=workers, force=args.force, chapters=args.chapters)
+        summary = None
+    else:
+        summary = extract_batch(args.paths, args.output, workers=workers, summary_path=args.summary, force=args.force,
+                                chapters=args.chapters)
+    if args.profile:
+        PROFILER.dump(args.profile)
+        print(f"Profile written to '{args.profile}' and '{args.profile}.folded'")
+    if summary and summary['failed']:
         sys.exit(1)
-    file_path = sys.argv[1]
-    output_base = "output"
-    result_dir = extract(file_path, output_base)
+
+
+if __name__ == "__main__":
+    main()
 
 """
 TODO: 
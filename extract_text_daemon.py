@@ -0,0 +1,220 @@
+import argparse
+import json
+import os
+import signal
+import time
+from collections import deque
+from multiprocessing import Pool, cpu_count
+
+import extract_text  # format backends load on first use and then stay loaded in each pool worker
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None  # not on Linux / not installed — fall back to polling
+
+"""
+Long-running extraction worker for a book inbox.
+
+python extract_text_daemon.py ~/books/inbox --output ~/books/text --workers 4
+
+New or changed .pdf/.epub/.txt/.html files in the watched folder are queued and extracted
+on a bounded process pool. Already extracted books are skipped through the extract_text
+manifest, so restarting the daemon is cheap. Queue depth and throughput counters are
+printed periodically and written to <output>/daemon_status.json.
+"""
+
+
+def _init_worker():
+    # Ctrl+C is handled by the daemon loop, which tears the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class ExtractionDaemon:
+    """Watches a folder and feeds new books to a persistent extraction pool."""
+
+    def __init__(self, watch_dir, output_base, workers=1, poll_interval=5.0, status_interval=30.0,
+                 chapters=False):
+        self.watch_dir = os.path.abspath(watch_dir)
+        self.output_base = os.path.abspath(output_base)
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.status_interval = status_interval
+        self.chapters = chapters
+        self.status_path = os.path.join(self.output_base, "daemon_status.json")
+
+        self.queue = deque()
+        self.queued = set()
+        self.in_flight = {}  # path -> AsyncResult
+        self.seen = {}  # path -> (size, mtime_ns) last handed to the pool
+        self.output_dirs = {}  # path -> output folder, fixed once chosen; manifests keep it across restarts
+        self._pending_stable = {}  # polling only: path -> signature seen on the previous scan
+
+        self.started_at = time.time()
+        self.counters = {'completed': 0, 'skipped': 0, 'failed': 0, 'bytes_extracted': 0, 'busy_seconds': 0.0}
+        self._last_status = 0.0
+
+    # --- discovery ---
+
+    def _signature(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _is_book(self, path):
+        return os.path.isfile(path) and os.path.splitext(path)[1].lower() in extract_text.SUPPORTED_EXTENSIONS
+
+    def _enqueue(self, path):
+        signature = self._signature(path)
+        if signature is None or self.seen.get(path) == signature or path in self.queued or path in self.in_flight:
+            return
+        self.queue.append(path)
+        self.queued.add(path)
+
+    def _scan(self):
+        """Polling fallback: a file is queued once its size/mtime held still for one interval."""
+        current = {}
+        with os.scandir(self.watch_dir) as entries:
+            for entry in entries:
+                if self._is_book(entry.path):
+                    current[entry.path] = self._signature(entry.path)
+        for path, signature in current.items():
+            if self._pending_stable.get(path) == signature:
+                self._enqueue(path)
+        self._pending_stable = current
+
+    # --- scheduling ---
+
+    def _dispatch(self, pool):
+        # bounded: at most 2 books per worker handed to the pool, the rest wait in our queue
+        while self.queue and len(self.in_flight) < self.workers * 2:
+            path = self.queue.popleft()
+            self.queued.discard(path)
+            self.seen[path] = self._signature(path)
+            if path not in self.output_dirs:
+                taken = {os.path.basename(d).lower() for d in self.output_dirs.values()}
+                self.output_dirs[path] = extract_text.book_output_dir(path, self.output_base, taken)
+            task = (path, self.output_dirs[path], False, self.chapters)
+            self.in_flight[path] = pool.apply_async(extract_text.batch_extract_one, (task,))
+
+    def _collect(self):
+        for path, async_result in list(self.in_flight.items()):
+            if not async_result.ready():
+                continue
+            del self.in_flight[path]
+            try:
+                result = async_result.get()
+            except Exception as e:
+                result = {'error': f"{type(e).__name__}: {e}", 'skipped': False, 'seconds': 0, 'size_bytes': 0}
+            if result['error']:
+                self.counters['failed'] += 1
+                status = f"FAILED ({result['error']})"
+            elif result['skipped']:
+                self.counters['skipped'] += 1
+                status = "up to date"
+            else:
+                self.counters['completed'] += 1
+                self.counters['bytes_extracted'] += result['size_bytes']
+                status = f"ok in {result['seconds']}s"
+            self.counters['busy_seconds'] += result['seconds'] or 0
+            print(f"[daemon] {os.path.basename(path)}: {status}")
+
+    # --- reporting ---
+
+    def status(self):
+        uptime = time.time() - self.started_at
+        done = self.counters['completed'] + self.counters['skipped'] + self.counters['failed']
+        return {
+            'watch_dir': self.watch_dir,
+            'uptime_seconds': round(uptime, 1),
+            'queue_depth': len(self.queue),
+            'in_flight': len(self.in_flight),
+            **{k: round(v, 3) if isinstance(v, float) else v for k, v in self.counters.items()},
+            'books_per_minute': round(done / uptime * 60, 3) if uptime else 0.0,
+            'mb_per_minute': round(self.counters['bytes_extracted'] / (1024 * 1024) / uptime * 60, 3) if uptime else 0.0,
+        }
+
+    def _report(self, force=False):
+        now = time.time()
+        if not force and now - self._last_status < self.status_interval:
+            return
+        self._last_status = now
+        status = self.status()
+        with open(self.status_path, 'w', encoding='utf-8') as f:
+            json.dump(status, f, indent=2)
+        print(f"[daemon] queue={status['queue_depth']} in_flight={status['in_flight']} "
+              f"done={status['completed']} skipped={status['skipped']} failed={status['failed']} "
+              f"{status['books_per_minute']} books/min")
+
+    # --- main loop ---
+
+    def run(self):
+        os.makedirs(self.output_base, exist_ok=True)
+        inotify = None
+        if INotify is not None:
+            inotify = INotify()
+            inotify.add_watch(self.watch_dir, flags.CLOSE_WRITE | flags.MOVED_TO)
+            print(f"[daemon] Watching '{self.watch_dir}' with inotify, {self.workers} worker(s)")
+        else:
+            print(f"[daemon] Watching '{self.watch_dir}' by polling every {self.poll_interval}s, {self.workers} worker(s)")
+
+        # anything already in the inbox; up-to-date books are skipped by the manifest
+        for path in sorted(extract_text.collect_input_files([self.watch_dir])):
+            if os.path.dirname(path) == self.watch_dir:
+                self._enqueue(path)
+
+        with Pool(processes=self.workers, initializer=_init_worker) as pool:
+            try:
+                while True:
+                    if inotify is not None:
+                        for event in inotify.read(timeout=int(self.poll_interval * 1000)):
+                            path = os.path.join(self.watch_dir, event.name)
+                            if self._is_book(path):
+                                self._enqueue(path)
+                    else:
+                        self._scan()
+                        time.sleep(self.poll_interval if not self.in_flight else min(self.poll_interval, 1.0))
+                    self._collect()
+                    self._dispatch(pool)
+                    self._report()
+            except KeyboardInterrupt:
+                print("\n[daemon] Stopping; extractions still running are abandoned.")
+            finally:
+                self._report(force=True)
+                if inotify is not None:
+                    inotify.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch a folder and extract new books with extract_text.")
+    parser.add_argument("watch_dir", help="Inbox folder to watch for new books")
+    parser.add_argument("--output", default="output", help="Base output directory (default: output)")
+    parser.add_argument("--workers", type=int, default=1, help="Books extracted in parallel (0 = all cores, default: 1)")
+    parser.add_argument("--poll-interval", type=float, default=5.0,
+                        help="Seconds between scans (polling) or inotify read timeout (default: 5)")
+    parser.add_argument("--status-interval", type=float, default=30.0,
+                        help="Seconds between status reports (default: 30)")
+    parser.add_argument("--chapters", action="store_true", help="Also write chapter indexes")
+    parser.add_argument("--tts", action="store_true", help="Verbalise numbers for TTS exports")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.watch_dir):
+        print(f"Not a directory: {args.watch_dir}")
+        return
+    if args.tts:
+        extract_text.set_tts_mode(True)
+    daemon = ExtractionDaemon(
+        args.watch_dir,
+        args.output,
+        workers=args.workers if args.workers > 0 else cpu_count(),
+        poll_interval=args.poll_interval,
+        status_interval=args.status_interval,
+        chapters=args.chapters,
+    )
+    daemon.run()
+
+
+if __name__ == '__main__':
+    main()
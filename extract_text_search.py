@@ -0,0 +1,279 @@
+import argparse
+import bisect
+import json
+import os
+import sqlite3
+import time
+
+"""
+Full-text search over books extracted by extract_text.
+
+python extract_text_search.py index output                 # add new/changed books to output/library.sqlite
+python extract_text_search.py query output "free will" -n 5 # ranked snippets with book, chapter and offset
+
+Each *_full_text.txt under the output folder is split into passages of a few paragraphs
+and stored in an SQLite FTS5 table together with its book, chapter (from the optional
+*_index.json written by --chapters) and byte offset in the text file. Re-indexing only
+touches books whose text file changed since the last run.
+"""
+
+INDEX_FILE = "library.sqlite"
+INDEX_VERSION = 3  # Bump when passages or stored fields change; older indexes are rebuilt on the next run
+TEXT_SUFFIX = "_full_text.txt"
+INDEX_SUFFIX = "_index.json"
+MANIFEST_FILE = ".extract_manifest.json"  # written by extract_text next to each book's text, records its source
+PASSAGE_BYTES = 2048  # passages are cut at the first line break past this size
+BOOKS_PER_TRANSACTION = 50
+SNIPPET_TOKENS = 16
+
+
+def open_search_index(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    _create_tables(conn)
+    return conn
+
+
+def _create_tables(conn):
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS books ("
+        " id INTEGER PRIMARY KEY, name TEXT NOT NULL, source TEXT, text_file TEXT NOT NULL UNIQUE,"
+        " size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,"
+        " first_passage INTEGER, last_passage INTEGER)"
+    )
+    conn.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS passages USING fts5("
+        " text, book_id UNINDEXED, chapter UNINDEXED, byte_offset UNINDEXED,"
+        " tokenize='unicode61 remove_diacritics 2')"
+    )
+
+
+def _book_name_and_source(output_base, text_file):
+    # the output folder tells book.pdf (book_pdf) and book.epub (book_epub) apart, the text file name doesn't
+    folder = os.path.dirname(text_file)
+    name = os.path.relpath(folder, output_base)
+    if name == os.curdir:
+        name = os.path.basename(text_file)[:-len(TEXT_SUFFIX)]
+    try:
+        with open(os.path.join(folder, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            source = json.load(f).get('source')
+    except (OSError, ValueError, AttributeError):
+        source = None
+    return name, source
+
+
+def find_text_files(output_base):
+    text_files = []
+    for root, _, files in os.walk(output_base):
+        for name in files:
+            if name.endswith(TEXT_SUFFIX):
+                text_files.append(os.path.join(root, name))
+    return sorted(text_files)
+
+
+def _load_chapter_starts(text_file):
+    # (byte offsets, titles) from the chapter index, or None for books extracted without --chapters
+    index_file = text_file[:-len(TEXT_SUFFIX)] + INDEX_SUFFIX
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            chapters = json.load(f)['chapters']
+    except (OSError, ValueError, KeyError):
+        return None
+    return [c['byte_offset'] for c in chapters], [c['title'] for c in chapters]
+
+
+def iter_passages(text_file, cut_offsets=()):
+    """Yield (byte_offset, text) passages of about PASSAGE_BYTES, cut on line breaks.
+
+    A passage also ends at every byte offset in cut_offsets (chapter starts), so none
+    spans two chapters.
+    """
+    cuts = sorted(cut_offsets)
+    next_cut = 0
+    with open(text_file, 'rb') as f:
+        offset = 0
+        start = 0
+        lines = []
+        size = 0
+        for line in f:
+            while next_cut < len(cuts) and cuts[next_cut] < offset + len(line):
+                cut = max(cuts[next_cut] - offset, 0)
+                next_cut += 1
+                if cut:
+                    if not lines:
+                        start = offset
+                    lines.append(line[:cut])
+                    line = line[cut:]
+                    offset += cut
+                if lines:
+                    yield start, b''.join(lines).decode('utf-8', errors='ignore')
+                    lines = []
+                    size = 0
+            if not lines:
+                start = offset
+            lines.append(line)
+            size += len(line)
+            offset += len(line)
+            if size >= PASSAGE_BYTES:
+                yield start, b''.join(lines).decode('utf-8', errors='ignore')
+                lines = []
+                size = 0
+        if lines:
+            yield start, b''.join(lines).decode('utf-8', errors='ignore')
+
+
+def _passage_rows(text_file, book_id):
+    chapter_starts = _load_chapter_starts(text_file)
+    for byte_offset, text in iter_passages(text_file, chapter_starts[0] if chapter_starts else ()):
+        if not text.strip():
+            continue
+        chapter = None
+        if chapter_starts:
+            offsets, titles = chapter_starts
+            position = bisect.bisect_right(offsets, byte_offset) - 1
+            chapter = titles[max(position, 0)]
+        yield text, book_id, chapter, byte_offset
+
+
+def _delete_book_passages(conn, first_passage, last_passage):
+    # each book's passages are inserted back to back, so a rowid range delete avoids a table scan
+    if first_passage is not None:
+        conn.execute("DELETE FROM passages WHERE rowid BETWEEN ? AND ?", (first_passage, last_passage))
+
+
+def _index_book(conn, text_file, name, source, size, mtime_ns, existing):
+    if existing:
+        book_id, first_passage, last_passage = existing
+        _delete_book_passages(conn, first_passage, last_passage)
+        conn.execute("UPDATE books SET name = ?, source = ?, size = ?, mtime_ns = ? WHERE id = ?",
+                     (name, source, size, mtime_ns, book_id))
+    else:
+        book_id = conn.execute(
+            "INSERT INTO books (name, source, text_file, size, mtime_ns) VALUES (?, ?, ?, ?, ?)",
+            (name, source, text_file, size, mtime_ns)
+        ).lastrowid
+    before = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM passages").fetchone()[0]
+    conn.executemany(
+        "INSERT INTO passages (text, book_id, chapter, byte_offset) VALUES (?, ?, ?, ?)",
+        _passage_rows(text_file, book_id)
+    )
+    after = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM passages").fetchone()[0]
+    span = (before + 1, after) if after > before else (None, None)
+    conn.execute("UPDATE books SET first_passage = ?, last_passage = ? WHERE id = ?", (*span, book_id))
+    return after - before
+
+
+def build_search_index(output_base, db_path=None):
+    """Index new and changed extracted books under output_base; returns a summary dict."""
+    db_path = db_path or os.path.join(output_base, INDEX_FILE)
+    conn = open_search_index(db_path)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+        conn.execute("DROP TABLE passages")
+        conn.execute("DROP TABLE books")
+        _create_tables(conn)
+        conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        conn.commit()
+    known = {
+        row[0]: row[1:]
+        for row in conn.execute("SELECT text_file, id, size, mtime_ns, first_passage, last_passage FROM books")
+    }
+    summary = {'indexed': 0, 'unchanged': 0, 'removed': 0, 'passages': 0}
+    start_time = time.perf_counter()
+    text_files = [os.path.abspath(p) for p in find_text_files(output_base)]
+    pending = 0
+    try:
+        for text_file in text_files:
+            stat = os.stat(text_file)
+            existing = known.get(text_file)
+            if existing and existing[1:3] == (stat.st_size, stat.st_mtime_ns):
+                summary['unchanged'] += 1
+                continue
+            book_entry = (existing[0], existing[3], existing[4]) if existing else None
+            name, source = _book_name_and_source(os.path.abspath(output_base), text_file)
+            summary['passages'] += _index_book(conn, text_file, name, source, stat.st_size, stat.st_mtime_ns, book_entry)
+            summary['indexed'] += 1
+            print(f"  Indexed {name}")
+            pending += 1
+            if pending >= BOOKS_PER_TRANSACTION:
+                conn.commit()
+                pending = 0
+        for text_file in set(known) - set(text_files):
+            book_id, _, _, first_passage, last_passage = known[text_file]
+            _delete_book_passages(conn, first_passage, last_passage)
+            conn.execute("DELETE FROM books WHERE id = ?", (book_id,))
+            summary['removed'] += 1
+        conn.commit()
+        if summary['indexed'] or summary['removed']:
+            # merge the FTS b-tree segments left by incremental inserts, keeps queries fast
+            conn.execute("INSERT INTO passages (passages) VALUES ('optimize')")
+            conn.commit()
+    finally:
+        conn.close()
+    summary['seconds'] = round(time.perf_counter() - start_time, 3)
+    return summary
+
+
+def search(db_path, query, limit=10):
+    """Best matching passages for an FTS5 query, as dicts ordered by bm25 rank."""
+    conn = open_search_index(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT books.name, books.source, passages.chapter, passages.byte_offset, books.text_file,"
+            f" snippet(passages, 0, '[', ']', '...', {SNIPPET_TOKENS}), passages.rank"
+            " FROM passages JOIN books ON books.id = passages.book_id"
+            " WHERE passages MATCH ? ORDER BY passages.rank LIMIT ?",
+            (query, limit)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [
+        {'book': name, 'source': source, 'chapter': chapter, 'byte_offset': byte_offset, 'text_file': text_file,
+         'snippet': ' '.join(snippet.split()), 'score': -rank}
+        for name, source, chapter, byte_offset, text_file, snippet, rank in rows
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text search over books extracted by extract_text.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    index_parser = subparsers.add_parser("index", help="Add new and changed extracted books to the index")
+    index_parser.add_argument("output_base", help="extract_text output folder")
+    index_parser.add_argument("--db", help=f"Index database (default: <output_base>/{INDEX_FILE})")
+    query_parser = subparsers.add_parser("query", help="Search the index")
+    query_parser.add_argument("output_base", help="extract_text output folder")
+    query_parser.add_argument("query", help="FTS5 query, e.g. 'free will', '\"free will\"' or 'free NEAR will'")
+    query_parser.add_argument("--db", help=f"Index database (default: <output_base>/{INDEX_FILE})")
+    query_parser.add_argument("-n", "--limit", type=int, default=10, help="Results to show (default: 10)")
+    query_parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(args.output_base, INDEX_FILE)
+    if args.command == "index":
+        summary = build_search_index(args.output_base, db_path)
+        print(f"{summary['indexed']} book(s) indexed ({summary['passages']} passages), "
+              f"{summary['unchanged']} unchanged, {summary['removed']} removed in {summary['seconds']}s")
+        return
+
+    if not os.path.exists(db_path):
+        print(f"No index at '{db_path}', run the index command first.")
+        return
+    start_time = time.perf_counter()
+    try:
+        results = search(db_path, args.query, args.limit)
+    except sqlite3.OperationalError as e:
+        print(f"Invalid query: {e}")
+        return
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    for result in results:
+        chapter = f" / {result['chapter']}" if result['chapter'] else ""
+        print(f"{result['book']}{chapter} @ byte {result['byte_offset']} (score {result['score']:.3g})")
+        print(f"    {result['snippet']}")
+    print(f"{len(results)} result(s) in {elapsed_ms:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,8 +9,13 @@ from dataclasses import dataclass
 from functools import wraps
 from functools import lru_cache
 import pyperclip
-from collections import Counter
+from collections import Counter, OrderedDict
 import math
+import bisect
+import numpy as np
+from text_source import MappedTextSource
+
+_NON_WORD_RE = re.compile(r'[^\w]')
 
 
 def profile_method(func):
@@ -44,7 +49,9 @@ class ReaderConfig:
     dim_color: tuple = (120, 120, 120)
     
     # Performance settings
-    max_cache_size: int = 1000
+    max_cache_size: int = 1000  # Rendered surfaces kept at most...
+    surface_cache_bytes: int = 32 * 1024 * 1024  # ...and within this much pixel memory
+    prewarm_words: int = 20  # Upcoming words rendered ahead of time while waiting for the next word
     save_threshold: int = 50  # Save every N words
     position_flush_interval: int = 10  # Flush position updates every N seconds
 
@@ -95,11 +102,69 @@ class PositionManager:
             print(f"Error flushing positions: {e}")
 
 
+class SurfaceCache:
+    """LRU cache of rendered text surfaces, bounded by entry count and pixel memory"""
+    
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()  # (text, color, font) -> surface, least recently used first
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.prewarmed = 0
+    
+    @staticmethod
+    def _surface_bytes(surface):
+        return surface.get_pitch() * surface.get_height()
+    
+    def _add(self, key, surface):
+        self.surfaces[key] = surface
+        self.bytes += self._surface_bytes(surface)
+        while len(self.surfaces) > 1 and (len(self.surfaces) > self.max_entries or self.bytes > self.max_bytes):
+            _, evicted = self.surfaces.popitem(last=False)
+            self.bytes -= self._surface_bytes(evicted)
+    
+    def get(self, text, color, font):
+        """Return the rendered surface, rendering it on a miss"""
+        # the font object itself is the key: the cache keeps it alive, so it can't alias like id(font)
+        key = (text, color, font)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self._add(key, surface)
+        return surface
+    
+    def warm(self, text, color, font):
+        """Render into the cache ahead of use; doesn't count as a hit or miss or refresh recency"""
+        key = (text, color, font)
+        if key not in self.surfaces:
+            self._add(key, font.render(text, True, color))
+            self.prewarmed += 1
+    
+    def stats(self):
+        """Human-readable counters, one string per overlay line"""
+        lookups = self.hits + self.misses
+        hit_rate = self.hits * 100 / lookups if lookups else 0.0
+        return (
+            f"Cache: {self.hits} hits / {self.misses} misses ({hit_rate:.1f}%)",
+            f"{len(self.surfaces)} surfaces · {self.bytes / (1024 * 1024):.1f}/{self.max_bytes / (1024 * 1024):.0f} MB",
+            f"{self.prewarmed} prewarmed",
+        )
+
+
 class SpeedReader:
     DEFAULT_WPM = 300
     MIN_WPM = 50
     MAX_WPM = 1000
     SKIP_WORDS = 10
+    SENTENCE_END_CHARS = ('.', '!', '?', '\n')
+    IDLE_WAIT_MS = 1000  # Longest sleep while paused; input wakes the loop immediately
+    FPS = 60
     WPM_ADJUST_SMALL = 10
     WPM_ADJUST_LARGE = 50
     SPECIAL_MULTIPLIERS = {
@@ -128,18 +193,22 @@ class SpeedReader:
     FREQ_MULTIPLIER_MAX = 1.2     # clamp multiplier to avoid huge slowdowns
     FREQ_MIN_COUNT = 1             # avoid division by zero (treated as very rare)
     
-    def __init__(self, text, config=None, file_path=None):
+    def __init__(self, text=None, config=None, file_path=None, words=None):
         self.config = config or ReaderConfig()
         self.raw_text = text
         self.file_path = file_path
         self.wpm = self.config.wpm
         
-        # Lazy loading
-        self._words = None
+        # Lazy loading (words may be pre-tokenised, e.g. streamed from a MappedTextSource)
+        self._words = words
         self._word_delays = None
-        self._cumulative_times = None
+        self._word_delays_wpm = None
+        self._word_weights = None
+        self._cumulative_weights = None
         self._word_counts = None
         self._total_words = None
+        self._word_table = None
+        self._sentence_starts = None
         
         # State
         self.paused = False
@@ -154,8 +223,15 @@ class SpeedReader:
         self.current_index = self._load_position()
         self.last_saved_index = self.current_index
         
+        # Rendering: only redraw on state changes, partially while playing
+        self._needs_redraw = True
+        self._full_redraw = True
+        self._word_rects = []  # screen areas drawn by the last partial word frame
+        
         # Caching
-        self.word_cache = {}
+        self.word_cache = SurfaceCache(self.config.max_cache_size, self.config.surface_cache_bytes)
+        self.show_debug = False
+        self._prewarmed_until = 0  # words before this index have been prewarmed
         self._cached_context = None
         self._cached_context_start = None
         
@@ -174,37 +250,63 @@ class SpeedReader:
             self._words = self._preprocess_text(self.raw_text)
         return self._words
     
+    @property
+    def word_weights(self):
+        """Lazy compute WPM-independent per-word delay multipliers (delay = weight * 60000 / wpm)"""
+        if self._word_weights is None:
+            ids, multipliers, freq_multipliers = self._analyse_words()
+            self._word_weights = multipliers[ids] * freq_multipliers[ids]
+        return self._word_weights
+    
+    @property
+    def cumulative_weights(self):
+        """Lazy compute suffix sums of word_weights: cumulative_weights[i] covers words i..end"""
+        if self._cumulative_weights is None:
+            self._cumulative_weights = np.cumsum(self.word_weights[::-1])[::-1]
+        return self._cumulative_weights
+    
     @property
     def word_delays(self):
-        """Lazy compute word delays"""
-        if self._word_delays is None:
-            self._word_delays = [self.get_delay(word) for word in self.words]
+        """Lazy compute whole-millisecond word delays at the current WPM"""
+        if self._word_delays is None or self._word_delays_wpm != self.wpm:
+            self._word_delays = self._compute_word_delays()
+            self._word_delays_wpm = self.wpm
         return self._word_delays
     
     @property
     def cumulative_times(self):
-        """Lazy compute cumulative times"""
-        if self._cumulative_times is None:
-            self._cumulative_times = self._compute_cumulative_times()
-        return self._cumulative_times
+        """Remaining time in ms from each word to the end at the current WPM (O(n), prefer time_left_ms)"""
+        return self.cumulative_weights * self._ms_per_weight()
+    
+    @property
+    def sentence_starts(self):
+        """Lazy compute sorted indices of words that open a sentence (0 and every word after an end mark)"""
+        if self._sentence_starts is None:
+            self._sentence_starts = [0] + [i + 1 for i, word in enumerate(self.words)
+                                           if word.endswith(self.SENTENCE_END_CHARS)]
+        return self._sentence_starts
     
     @property
     def word_counts(self):
         """Lazy compute cleaned, lowercased word frequency counts for this text."""
         if self._word_counts is None:
-            # Normalize words to alphanumeric-only lowercased tokens for counting
-            cleaned_tokens = [
-                re.sub(r'[^\w]', '', w).lower() for w in self.words if w.strip()
-            ]
-            # Filter out empty strings from punctuation-only tokens
-            cleaned_tokens = [t for t in cleaned_tokens if t]
-            self._word_counts = Counter(cleaned_tokens)
-            self._total_words = sum(self._word_counts.values()) or 1
+            self._analyse_words()
         return self._word_counts
     
-    def _invalidate_timing_cache(self):
-        self._word_delays = None
-        self._cumulative_times = None
+    def _ms_per_weight(self):
+        return 60000 / self.wpm
+    
+    def word_delay(self, index):
+        """Delay in ms of the word at index at the current WPM"""
+        if index >= len(self.words):
+            return self.get_delay()
+        return self.word_weights[index] * self._ms_per_weight()
+    
+    def time_left_ms(self, index):
+        """Time in ms to read from index to the end at the current WPM"""
+        if index >= len(self.words):
+            return 0
+        return self.cumulative_weights[index] * self._ms_per_weight()
     
     def _init_pygame(self):
         """Initialize pygame and create window"""
@@ -230,13 +332,58 @@ class SpeedReader:
                 words.append(word)
         return words
     
-    def _compute_cumulative_times(self):
-        total = 0
-        cumulative = [0] * len(self.word_delays)
-        for i in reversed(range(len(self.word_delays))):
-            total += self.word_delays[i]
-            cumulative[i] = total
-        return cumulative
+    def _analyse_words(self):
+        """Tokenise the text once into per-word arrays of timing multipliers.
+
+        Returns (ids, multipliers, freq_multipliers): ids maps every word to its distinct
+        spelling, the other two hold length+punctuation and frequency multipliers per spelling.
+        Every string is cleaned once per distinct spelling instead of once per occurrence, and
+        multipliers come from small per-length/per-count tables evaluated with the same scalar
+        math as get_delay, so the batch delays are identical to the per-word ones.
+        """
+        if self._word_table is not None:
+            return self._word_table
+        spellings = list(dict.fromkeys(self.words))
+        vocabulary = {word: i for i, word in enumerate(spellings)}
+        ids = np.fromiter(map(vocabulary.__getitem__, self.words), dtype=np.int64, count=len(self.words))
+        occurrences = np.bincount(ids, minlength=len(spellings))
+        cleaned = [_NON_WORD_RE.sub('', word) for word in spellings]
+
+        # Normalize words to alphanumeric-only lowercased tokens for counting
+        tokens = [word.lower() for word in cleaned]
+        token_ids = {token: i for i, token in enumerate(dict.fromkeys(tokens))}
+        spelling_tokens = np.fromiter(map(token_ids.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        token_counts = np.bincount(spelling_tokens, weights=occurrences, minlength=len(token_ids)).astype(np.int64)
+        self._word_counts = Counter({token: int(count) for token, count in zip(token_ids, token_counts) if token})
+        self._total_words = sum(self._word_counts.values()) or 1
+
+        lengths = np.fromiter(map(len, cleaned), dtype=np.int64, count=len(cleaned))
+        length_table = np.array([self._length_multiplier(n) for n in range(int(lengths.max(initial=0)) + 1)])
+        # punctuation class: first SPECIAL_MULTIPLIERS entry found in the word, like get_delay's loop
+        specials = list(self.SPECIAL_MULTIPLIERS.values()) + [0.0]
+        no_special = len(specials) - 1
+        punct_class = np.full(len(spellings), no_special, dtype=np.int64)
+        joined = '\0'.join(spellings)
+        spelling_starts = np.cumsum([0] + [len(word) + 1 for word in spellings[:-1]])
+        for position, char in reversed(list(enumerate(self.SPECIAL_MULTIPLIERS))):
+            hits = np.fromiter((m.start() for m in re.finditer(re.escape(char), joined)), dtype=np.int64)
+            punct_class[np.searchsorted(spelling_starts, hits, side='right') - 1] = position
+        multipliers = length_table[lengths] + np.array(specials)[punct_class]
+
+        spelling_counts = token_counts[spelling_tokens]
+        distinct_counts, count_index = np.unique(spelling_counts, return_inverse=True)
+        freq_table = np.array([self._frequency_multiplier_for_count(int(count)) for count in distinct_counts])
+        freq_multipliers = freq_table[count_index.reshape(-1)] if len(spellings) else np.ones(0)
+        freq_multipliers[lengths == 0] = 1.0  # punctuation-only words have no token to count
+
+        self._word_table = (ids, multipliers, freq_multipliers)
+        return self._word_table
+
+    def _compute_word_delays(self):
+        ids, multipliers, freq_multipliers = self._analyse_words()
+        base_delay = 60000 / self.wpm
+        # same operation order as get_delay, then truncation like int()
+        return (base_delay * multipliers[ids] * freq_multipliers[ids]).astype(np.int64)
     
     def _get_file_hash(self):
         """Generate a hash from the file path for saving position"""
@@ -287,7 +434,9 @@ class SpeedReader:
         """Return frequency-based multiplier for a cleaned, lowercased token."""
         if not token:
             return 1.0
-        count = self.word_counts.get(token, 0)
+        return self._frequency_multiplier_for_count(self.word_counts.get(token, 0))
+
+    def _frequency_multiplier_for_count(self, count):
         count = max(count, self.FREQ_MIN_COUNT)
         total = self._total_words or len(self.words) or 1
         rarity_score = math.log10(total / count)
@@ -302,7 +451,7 @@ class SpeedReader:
             return int(base_delay)
         
         # Get word length
-        clean_word = re.sub(r'[^\w]', '', word)
+        clean_word = _NON_WORD_RE.sub('', word)
         word_length = len(clean_word)
         
         # Find appropriate multiplier
@@ -351,43 +500,28 @@ class SpeedReader:
         # Clamp index to valid range [0, len(self.words)-1]
         index = max(0, min(index, len(self.words) - 1))
 
-        start = index
-        while start > 0:
-            word = self.words[start - 1]
-            if word.endswith(('.', '!', '?', '\n')):
-                break
-            start -= 1
-
-        return start
+        starts = self.sentence_starts
+        return starts[bisect.bisect_right(starts, index) - 1]
     
     def get_next_phrase_start(self):
         """Get the starting index of the next phrase/paragraph"""
-        index = self.current_index + 1
-        while index < len(self.words):
-            word = self.words[index]
-            if word.endswith(('.', '!', '?', '\n')):
-                return min(index + 1, len(self.words) - 1)
-            index += 1
+        # first sentence opened by an end mark at or after current_index + 1
+        starts = self.sentence_starts
+        position = bisect.bisect_left(starts, self.current_index + 2)
+        if position < len(starts):
+            return min(starts[position], len(self.words) - 1)
         return len(self.words) - 1
     
     def get_previous_phrase_start(self):
         """Get the starting index of the previous phrase/paragraph"""
-        index = self.current_index - 1
-        while index > 0:
-            word = self.words[index]
-            if word.endswith(('.', '!', '?', '\n')):
-                break
-            index -= 1
-        
-        if index > 0:
-            index -= 1
-            while index > 0:
-                word = self.words[index]
-                if word.endswith(('.', '!', '?', '\n')):
-                    break
-                index -= 1
-            return max(index + 1, 0) if index > 0 else 0
-        return 0
+        # skip back past the current sentence's opening, then to the one before it;
+        # starts below 2 (end marks on the first word) count as the beginning
+        starts = self.sentence_starts
+        position = bisect.bisect_right(starts, self.current_index) - 1
+        if position < 0 or starts[position] < 2:
+            return 0
+        previous = starts[position - 1]
+        return previous if previous >= 2 else 0
     
     def effective_wpm_from_remaining(self) -> int:
         """Estimate WPM implied by remaining_time / remaining_words (rounded)."""
@@ -395,7 +529,7 @@ class SpeedReader:
         if not self.words or self.current_index >= len(self.words) - 1:
             return 0
         remaining_words = len(self.words) - self.current_index
-        remaining_ms = max(1, self.cumulative_times[self.current_index])  # avoid div0
+        remaining_ms = max(1, self.time_left_ms(self.current_index))  # avoid div0
         eff = (remaining_words * 60000) / remaining_ms
         return int(eff)
     
@@ -408,15 +542,14 @@ class SpeedReader:
             self._cached_context_start == sentence_start):
             return self._cached_context
         
-        # Calculate new context
+        # Calculate new context: up to the next sentence start, or the last word
         start = sentence_start
-        end = self.current_index
-        
-        while end < len(self.words) - 1:
-            word = self.words[end]
-            end += 1
-            if word.endswith(('.', '!', '?', '\n')):
-                break
+        starts = self.sentence_starts
+        position = bisect.bisect_right(starts, self.current_index)
+        if position < len(starts) and starts[position] < len(self.words):
+            end = starts[position]
+        else:
+            end = max(self.current_index, len(self.words) - 1)
         
         # Cache result
         self._cached_context = (start, end)
@@ -426,36 +559,69 @@ class SpeedReader:
     
     def get_rendered_word(self, word, color, font):
         """Get cached rendered word surface"""
-        cache_key = (word, color, id(font))
-        
-        if cache_key not in self.word_cache:
-            # Limit cache size
-            if len(self.word_cache) >= self.config.max_cache_size:
-                # Remove oldest entry
-                self.word_cache.pop(next(iter(self.word_cache)))
-            
-            self.word_cache[cache_key] = font.render(word, True, color)
-        
-        return self.word_cache[cache_key]
+        return self.word_cache.get(word, color, font)
+    
+    def _split_orp(self, word):
+        """Split word into (before, ORP character, after)"""
+        orp_index = self.find_orp(word)
+        if orp_index >= len(word):
+            return word[:orp_index], '', ''
+        return word[:orp_index], word[orp_index], word[orp_index + 1:]
+    
+    def prewarm(self):
+        """Render the next prewarm_words words into the surface cache; one word per call, so an idle tick stays short"""
+        end = min(self.current_index + 1 + self.config.prewarm_words, len(self.words))
+        start = self._prewarmed_until
+        if not self.current_index < start <= end:
+            start = self.current_index + 1  # first call, or the reader jumped
+        if start >= end:
+            return False
+        before, orp_char, after = self._split_orp(self.words[start])
+        self.word_cache.warm(before, self.config.text_color, self.font_large)
+        self.word_cache.warm(orp_char, self.config.highlight_color, self.font_large)
+        self.word_cache.warm(after, self.config.text_color, self.font_large)
+        self._prewarmed_until = start + 1
+        return True
+    
+    def _draw_debug_overlay(self):
+        """Draw surface cache statistics in the top-right corner; returns the covered rect"""
+        rects = []
+        y = 20
+        for line in self.word_cache.stats():
+            # rendered directly: the text changes every frame and would only churn the cache
+            line_surf = self.font_small.render(line, True, self.config.dim_color)
+            rects.append(self.screen.blit(line_surf, line_surf.get_rect(topright=(self.width - 20, y))))
+            y += 25
+        return rects[0].unionall(rects[1:])
     
     @profile_method
-    def draw_word(self):
-        """Draw single word with red ORP letter centered on-screen"""
-        self.screen.fill(self.config.bg_color)
+    def draw_word(self, full=True):
+        """Draw single word with red ORP letter centered on-screen.
+        
+        With full=False only the word and progress info are erased and redrawn; returns the
+        changed rects for display.update(), or None when the whole screen was redrawn.
+        """
+        if self.current_index >= len(self.words) or self.jump_mode:
+            full = True
+        previous_rects = self._word_rects
+        if full:
+            self.screen.fill(self.config.bg_color)
+        else:
+            for rect in previous_rects:
+                self.screen.fill(self.config.bg_color, rect)
+        rects = []
         
         if self.current_index >= len(self.words):
             text = self.font_large.render("Finished!", True, self.config.text_color)
             rect = text.get_rect(center=(self.width // 2, self.height // 2))
             self.screen.blit(text, rect)
-            return
+            self._word_rects = []
+            return None
         
         word = self.words[self.current_index]
-        orp_index = self.find_orp(word)
         
         # Split word into parts
-        before = word[:orp_index]
-        orp_char = word[orp_index] if orp_index < len(word) else ''
-        after = word[orp_index + 1:] if orp_index < len(word) else ''
+        before, orp_char, after = self._split_orp(word)
         
         # Use cached rendering
         before_surf = self.get_rendered_word(before, self.config.text_color, self.font_large)
@@ -480,13 +646,13 @@ class SpeedReader:
             after_x = start_x + before_surf.get_width() + orp_surf.get_width()
         
         # Draw word parts
-        self.screen.blit(before_surf, (before_x, y))
-        self.screen.blit(orp_surf, (orp_x, y))
-        self.screen.blit(after_surf, (after_x, y))
+        rects.append(self.screen.blit(before_surf, (before_x, y)))
+        rects.append(self.screen.blit(orp_surf, (orp_x, y)))
+        rects.append(self.screen.blit(after_surf, (after_x, y)))
         
         # Calculate time remaining
         if self.current_index < len(self.words) - 1:
-            total_time_ms = self.cumulative_times[self.current_index]
+            total_time_ms = self.time_left_ms(self.current_index)
         else:
             total_time_ms = 0
         
@@ -502,11 +668,18 @@ class SpeedReader:
         ]
         
         for text in info_texts:
-            info_surf = self.get_rendered_word(text, self.config.dim_color, self.font_small)
-            self.screen.blit(info_surf, (20, info_y))
+            # one-off strings, rendered directly so they don't evict cached words
+            info_surf = self.font_small.render(text, True, self.config.dim_color)
+            rects.append(self.screen.blit(info_surf, (20, info_y)))
             info_y += 25
+        if self.show_debug:
+            rects.append(self._draw_debug_overlay())
+        self._word_rects = rects
         
-        # Draw controls
+        if not full:
+            return previous_rects + rects
+        
+        # Draw controls (static, only on full redraws)
         controls = "SPACE: Pause | </>: Skip 10 | +/-: Speed | HOME/END: Start/End | J: Jump % | JJ: Jump word | ESC: Quit"
         controls_surf = self.get_rendered_word(controls, self.config.dim_color, self.font_small)
         self.screen.blit(controls_surf, (20, self.height - 40))
@@ -514,6 +687,7 @@ class SpeedReader:
         # Draw jump mode indicator
         if self.jump_mode:
             self._draw_jump_indicator()
+        return None
 
     
     @profile_method
@@ -562,14 +736,17 @@ class SpeedReader:
         
         # time remaining
         if self.current_index < len(self.words) - 1:
-            total_time_ms = self.cumulative_times[self.current_index]
+            total_time_ms = self.time_left_ms(self.current_index)
         else:
             total_time_ms = 0
         time_str = self._format_time(total_time_ms / 1000)
         info_text = f"Time left: {time_str}"
-        info_rendered = self.get_rendered_word(info_text, self.config.dim_color, self.font_small)
+        info_rendered = self.font_small.render(info_text, True, self.config.dim_color)
         self.screen.blit(info_rendered, (20, self.height - 65))
         
+        if self.show_debug:
+            self._draw_debug_overlay()
+        
         # Draw jump mode indicator  # TODO: FIX - jump mode works as shortcut, but no visual thing appears
         if self.jump_mode:
             self._draw_jump_indicator()
@@ -604,19 +781,45 @@ class SpeedReader:
         else:
             return f"{seconds}s"
     
-    def handle_input(self):
-        """Handle keyboard input"""
-        for event in pygame.event.get():
+    def handle_input(self, events=()):
+        """Handle keyboard input (events already taken off the queue first, then the queue)"""
+        for event in list(events) + pygame.event.get():
             if event.type == pygame.QUIT:
                 self.save_position(force=True)
                 return False
             
+            if event.type in (pygame.KEYDOWN, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.VIDEOEXPOSE):
+                # any key can change mode, speed or position; exposed windows need repainting
+                self._needs_redraw = True
+                self._full_redraw = True
+            
             if event.type == pygame.KEYDOWN:
                 if not self._handle_keydown(event):
                     return False
         
         return True
     
+    def _wait_for_input(self):
+        """Sleep until an event arrives (or IDLE_WAIT_MS passes); returns the event as a list"""
+        event = pygame.event.wait(self.IDLE_WAIT_MS)
+        return [] if event.type == pygame.NOEVENT else [event]
+    
+    def render(self):
+        """Redraw the screen if state changed since the last frame"""
+        if not self._needs_redraw:
+            return
+        if self.show_context:
+            self.draw_context()
+            rects = None
+        else:
+            rects = self.draw_word(full=self._full_redraw)
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        self._needs_redraw = False
+        self._full_redraw = False
+    
     def _handle_keydown(self, event):
         """Handle keydown events"""
         if event.key == pygame.K_ESCAPE:
@@ -700,6 +903,9 @@ class SpeedReader:
         elif event.key == pygame.K_c and self.paused:
             self._copy_context()
         
+        elif event.key == pygame.K_F3:
+            self.show_debug = not self.show_debug
+        
         elif event.key == pygame.K_j:
             self.jump_mode = True
             self.jump_type = 'percent'
@@ -733,12 +939,10 @@ class SpeedReader:
         elif event.key in (pygame.K_UP, pygame.K_EQUALS, pygame.K_PLUS):
             adjust = self.WPM_ADJUST_LARGE if mods & pygame.KMOD_CTRL else self.WPM_ADJUST_SMALL
             self.wpm = min(self.wpm + adjust, self.MAX_WPM)
-            self._invalidate_timing_cache()
         
         elif event.key in (pygame.K_DOWN, pygame.K_MINUS):
             adjust = self.WPM_ADJUST_LARGE if mods & pygame.KMOD_CTRL else self.WPM_ADJUST_SMALL
             self.wpm = max(self.wpm - adjust, self.MIN_WPM)
-            self._invalidate_timing_cache()
         
         return True
         
@@ -762,17 +966,18 @@ class SpeedReader:
         self.paused = True
         
         while running:
-            running = self.handle_input()
+            # paused with nothing to draw: block on the event queue instead of spinning at 60 FPS
+            idle = self.paused and not self._needs_redraw
+            running = self.handle_input(self._wait_for_input() if idle else ())
             
             # Update word index if not paused and not in jump mode
             if not self.paused and not self.jump_mode:
                 current_time = pygame.time.get_ticks()
-                current_word = self.words[self.current_index] if self.current_index < len(self.words) else None
-                
-                if current_time - self.last_update >= self.get_delay(current_word):
+                if current_time - self.last_update >= self.word_delay(self.current_index):
                     self.current_index += 1
                     self.last_update = current_time
                     self._cached_context = None  # Invalidate cache
+                    self._needs_redraw = True
                     
                     if self.current_index >= len(self.words):
                         self.paused = True
@@ -782,14 +987,12 @@ class SpeedReader:
                     self.save_position()
                     self.last_save = current_time
             
-            # Draw
-            if self.show_context:
-                self.draw_context()
-            else:
-                self.draw_word()
-            
-            pygame.display.flip()
-            self.clock.tick(60)
+            rendered = self._needs_redraw
+            self.render()
+            if not self.paused:
+                if not rendered:
+                    self.prewarm()  # idle tick: nothing changed on screen this frame
+                self.clock.tick(self.FPS)
         
         # Final save and cleanup
         self.save_position(force=True)
@@ -804,8 +1007,9 @@ def main():
 
     txt_path = sys.argv[1]
     try:
-        with open(txt_path, 'r', encoding='utf-8') as file:
-            content_txt = file.read()
+        # tokenised straight from the mapped file, no full-text copy is ever held
+        with MappedTextSource(txt_path) as source:
+            words = list(source.iter_tokens())
     except FileNotFoundError:
         print(f"Error: Could not find file at {txt_path}")
         return
@@ -816,7 +1020,7 @@ def main():
         window_height=600
     )
     
-    reader = SpeedReader(content_txt, config=config, file_path=txt_path)
+    reader = SpeedReader(config=config, file_path=txt_path, words=words)
     reader.run()
 
 
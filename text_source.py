@@ -0,0 +1,88 @@
+import codecs
+import mmap
+import os
+
+
+class MappedTextSource:
+    """Memory-mapped text file decoded lazily in fixed-size chunks.
+
+    Only one chunk of bytes and its decoded text are alive at a time, so multi-GB dumps
+    can be walked by line, paragraph or token without reading the whole file into RAM.
+    """
+
+    def __init__(self, path, encoding='utf-8', errors='strict', chunk_size=1 << 20):
+        self.path = path
+        self.encoding = encoding
+        self.errors = errors
+        self.chunk_size = chunk_size
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        # mmap refuses empty files
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def iter_chunks(self):
+        """Yield decoded text chunks; multi-byte characters split across chunks are handled."""
+        if self._map is None:
+            return
+        decoder = codecs.getincrementaldecoder(self.encoding)(self.errors)
+        for start in range(0, self.size, self.chunk_size):
+            text = decoder.decode(self._map[start:start + self.chunk_size])
+            if text:
+                yield text
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+    def iter_lines(self):
+        """Yield lines with their trailing '\\n', like iterating over a text file.
+
+        Line endings are universal newlines: '\\r\\n' and a lone '\\r' both come out as '\\n'.
+        """
+        pending = ''
+        for chunk in self.iter_chunks():
+            text = pending + chunk
+            # a chunk ending in '\r' may be the first half of a '\r\n' split across chunks
+            carry = '\r' if text.endswith('\r') else ''
+            if carry:
+                text = text[:-1]
+            lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+            pending = lines.pop() + carry
+            for line in lines:
+                yield line + '\n'
+        if pending:
+            yield pending.replace('\r', '\n')
+
+    def iter_paragraphs(self):
+        """Yield blank-line separated paragraphs, without the separating blank lines."""
+        paragraph = []
+        for line in self.iter_lines():
+            if line.strip():
+                paragraph.append(line)
+            elif paragraph:
+                yield ''.join(paragraph)
+                paragraph = []
+        if paragraph:
+            yield ''.join(paragraph)
+
+    def iter_tokens(self):
+        """Yield whitespace-separated tokens, same as str.split() over the whole text."""
+        pending = ''
+        for chunk in self.iter_chunks():
+            tokens = (pending + chunk).split()
+            # the last token may continue in the next chunk unless the chunk ended on whitespace
+            pending = tokens.pop() if tokens and not chunk[-1].isspace() else ''
+            yield from tokens
+        if pending:
+            yield pending